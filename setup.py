@@ -19,6 +19,7 @@ setup(
         "python-dotenv>=1.0.0",
         "firebase-admin>=6.0.0",
         "email-validator>=2.0.0",  # For Pydantic's EmailStr validation
+        "orjson>=3.9.0",  # Default JSON response serializer
     ],
     extras_require={
         "dev": [
@@ -32,10 +33,16 @@ setup(
             "uvloop",
             "httptools",
             "gunicorn",
+            "h2",  # HTTP/2 for the shared upstream HTTP clients
         ],
         "ingestion": [
             "langchain-unstructured",
             "pdfplumber",
+            "ijson>=3.1",  # Streams large JSON arrays in the embed CLI
+        ],
+        "faiss": [
+            "faiss-cpu",  # In-memory sample retriever (VECTOR_BACKEND=faiss)
+            "langchain-community",
         ]
     },
     entry_points={
@@ -1,17 +1,18 @@
 """
 Tests for Firebase authentication module.
 """
+import time
 import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime
-from uuid import UUID
 
 from wise_nutrition.models.user import UserCreate, UserLogin, UserResponse
+from wise_nutrition.auth import firebase_auth
 from wise_nutrition.auth.firebase_auth import FirebaseAuthManager
 
 # Mock Firebase user object
 class MockFirebaseUser:
-    def __init__(self, uid="123e4567-e89b-12d3-a456-426614174000", email="test@example.com"):
+    def __init__(self, uid="Ht7YxQ2mVbN9kLp4RsT1uWz3aBc8", email="test@example.com"):
         self.uid = uid
         self.email = email
         self.display_name = "Test User"
@@ -120,13 +121,13 @@ class TestFirebaseAuthManager:
         
         # Call the method under test
         result = await FirebaseAuthManager.update_user(
-            UUID("123e4567-e89b-12d3-a456-426614174000"),
+            "Ht7YxQ2mVbN9kLp4RsT1uWz3aBc8",
             update_data
         )
         
         # Verify Firebase was called correctly
         mock_auth.update_user.assert_called_once_with(
-            "123e4567-e89b-12d3-a456-426614174000",
+            "Ht7YxQ2mVbN9kLp4RsT1uWz3aBc8",
             email="updated@example.com",
             display_name="Updated Name"
         )
@@ -134,4 +135,69 @@ class TestFirebaseAuthManager:
         # Check result
         assert isinstance(result, UserResponse)
         assert result.email == mock_firebase_user.email
-        assert result.full_name == mock_firebase_user.display_name 
\ No newline at end of file
+        assert result.full_name == mock_firebase_user.display_name 
+
+class TestTokenCache:
+    """Test the verified-token cache used by get_current_user."""
+    
+    def setup_method(self):
+        """Start every test with an empty cache."""
+        firebase_auth._token_cache.clear()
+    
+    def _user(self):
+        return UserResponse(
+            id="Ht7YxQ2mVbN9kLp4RsT1uWz3aBc8",
+            email="test@example.com",
+            full_name="Test User",
+            is_active=True,
+            created_at=datetime.now()
+        )
+    
+    def test_cached_user_is_returned_until_expiry(self):
+        """Test that a cached user is served until the token expires."""
+        key = firebase_auth._token_cache_key("token")
+        user = self._user()
+        
+        firebase_auth._cache_user(key, user, time.time() + 60)
+        assert firebase_auth._get_cached_user(key) is user
+        
+        firebase_auth._cache_user(key, user, time.time() - 1)
+        assert firebase_auth._get_cached_user(key) is None
+        assert key not in firebase_auth._token_cache
+    
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache stays within its maximum size."""
+        user = self._user()
+        with patch.object(firebase_auth, "TOKEN_CACHE_MAX_SIZE", 2):
+            for token in ("a", "b", "c"):
+                firebase_auth._cache_user(firebase_auth._token_cache_key(token), user, time.time() + 60)
+        
+        assert len(firebase_auth._token_cache) == 2
+        assert firebase_auth._get_cached_user(firebase_auth._token_cache_key("a")) is None
+
+
+class TestAuthDependencies:
+    """Tests for the request-level auth dependencies."""
+
+    def setup_method(self):
+        firebase_auth.is_dev_mode.cache_clear()
+
+    def teardown_method(self):
+        firebase_auth.is_dev_mode.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_dev_mode_returns_mock_user_without_token(self, monkeypatch):
+        monkeypatch.setenv("WISE_NUTRITION_DEV_MODE", "true")
+
+        user = await firebase_auth.get_current_user(token=None)
+
+        assert user.email == "dev@example.com"
+
+    @pytest.mark.asyncio
+    async def test_missing_token_is_rejected_outside_dev_mode(self, monkeypatch):
+        monkeypatch.setenv("WISE_NUTRITION_DEV_MODE", "false")
+
+        with pytest.raises(firebase_auth.HTTPException) as exc_info:
+            await firebase_auth.get_current_user(token=None)
+
+        assert exc_info.value.status_code == 401
@@ -0,0 +1,44 @@
+"""
+Shared pytest fixtures.
+"""
+import sys
+
+import pytest
+
+from wise_nutrition.utils.config import Config, ensure_env_loaded
+
+
+def pytest_configure(config):
+    """Parse .env once per test session, before any test module is imported."""
+    ensure_env_loaded()
+
+
+def _reset_shared_instances():
+    Config.instance.cache_clear()
+    # Only reset the Weaviate clients if a test has imported the module;
+    # importing it here would pull weaviate into every test run
+    embedding_manager = sys.modules.get("wise_nutrition.embeddings.embedding_manager")
+    if embedding_manager is not None:
+        embedding_manager.close_weaviate_clients()
+    embed_cli = sys.modules.get("wise_nutrition.cli.embed")
+    if embed_cli is not None:
+        embed_cli._get_manager.cache_clear()
+    dependencies = sys.modules.get("wise_nutrition.dependencies")
+    if dependencies is not None:
+        dependencies.reset_dependencies()
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    """Write conversation checkpoints to a per-test directory instead of the repo."""
+    path = tmp_path / "checkpoints"
+    monkeypatch.setenv("CONVERSATION_CHECKPOINT_DIR", str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_instances():
+    """Drop process-wide singletons so environment changes and mocks don't leak between tests."""
+    _reset_shared_instances()
+    yield
+    _reset_shared_instances()
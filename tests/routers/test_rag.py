@@ -37,8 +37,8 @@ def test_rag_invoke_endpoint(test_input, monkeypatch):
     
     This test mocks the NutritionRAGChain to avoid actual API calls.
     """
-    # Mock the NutritionRAGChain invoke method to return a predefined response
-    def mock_invoke(self, input_data, config=None):
+    # Mock the NutritionRAGChain ainvoke method to return a predefined response
+    async def mock_ainvoke(self, input_data, config=None, **kwargs):
         return RAGOutput(
             query=input_data.query,
             response="This is a mock response for testing purposes.",
@@ -47,9 +47,9 @@ def test_rag_invoke_endpoint(test_input, monkeypatch):
             session_id=input_data.session_id or "test-session"
         )
     
-    # Apply the monkeypatch to the NutritionRAGChain.invoke method
+    # Apply the monkeypatch to the NutritionRAGChain.ainvoke method
     from wise_nutrition.rag_chain import NutritionRAGChain
-    monkeypatch.setattr(NutritionRAGChain, "invoke", mock_invoke)
+    monkeypatch.setattr(NutritionRAGChain, "ainvoke", mock_ainvoke)
     
     # Call the public endpoint with the test input
     response = client.post("/api/v1/nutrition_rag_chain/public", json=test_input)
@@ -0,0 +1,58 @@
+"""
+Tests for the application middleware.
+"""
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from wise_nutrition.api import BodySizeLimitMiddleware
+
+
+class Payload(BaseModel):
+    text: str
+
+
+def _client(max_body: int) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/parsed")
+    async def parsed(payload: Payload):
+        return {"length": len(payload.text)}
+
+    @app.post("/raw")
+    async def raw(request: Request):
+        return {"length": len(await request.body())}
+
+    app.add_middleware(BodySizeLimitMiddleware, max_body=max_body)
+    return TestClient(app)
+
+
+def _chunks(count: int, size: int):
+    for _ in range(count):
+        yield b"x" * size
+
+
+class TestBodySizeLimitMiddleware:
+    """Test that oversized request bodies are rejected."""
+
+    def test_small_body_passes(self):
+        """Bodies within the limit reach the endpoint."""
+        response = _client(100).post("/parsed", json={"text": "vitamin D"})
+
+        assert response.status_code == 200
+        assert response.json() == {"length": 9}
+
+    def test_declared_length_over_limit(self):
+        """A Content-Length over the limit is rejected before the body is read."""
+        response = _client(100).post("/raw", content=b"x" * 200)
+
+        assert response.status_code == 413
+
+    def test_chunked_body_over_limit(self):
+        """Bodies without a Content-Length are counted as they are received."""
+        client = _client(100)
+
+        for path in ("/parsed", "/raw"):
+            response = client.post(path, content=_chunks(5, 30))
+            assert response.status_code == 413
+            assert response.json() == {"detail": "Request body exceeds 100 bytes"}
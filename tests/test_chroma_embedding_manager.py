@@ -89,7 +89,24 @@ class TestChromaEmbeddingManager:
         # Check that documents were added to the vector store
         mock_vector_store.add_documents.assert_called_once_with(documents)
         # No need to check persist() as it's not called anymore
-    
+
+    def test_add_documents_sync_in_batches(self):
+        """Test that large document lists are written in batches."""
+        documents = [
+            Document(page_content=f"Test document {i}", metadata={"chunk_id": f"doc{i}"})
+            for i in range(5)
+        ]
+
+        mock_vector_store = MagicMock()
+        self.embedding_manager._vector_store = mock_vector_store
+
+        with patch('wise_nutrition.embeddings.chroma_embedding_manager.ADD_BATCH_SIZE', 2):
+            self.embedding_manager.add_documents_sync(documents)
+
+        batches = [call.args[0] for call in mock_vector_store.add_documents.call_args_list]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [doc for batch in batches for doc in batch] == documents
+
     @pytest.mark.asyncio
     async def test_initialize_vector_store_existing(self):
         """Test initializing vector store when the collection already exists."""
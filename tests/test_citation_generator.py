@@ -3,6 +3,7 @@ Tests for the citation generation system.
 """
 import unittest
 from datetime import datetime
+from unittest.mock import patch
 
 from langchain_core.documents import Document
 from wise_nutrition.citation_generator import CitationGenerator, Citation
@@ -117,6 +118,16 @@ class TestCitationGenerator(unittest.TestCase):
         # Verify the citations have the correct source names
         self.assertEqual(result[0].source_name, "National Institutes of Health")
         self.assertEqual(result[1].source_name, "American Dietetic Association")
+    
+    def test_access_date_is_reused_within_ttl(self):
+        """Test that consecutive citations reuse the formatted access date."""
+        with patch("wise_nutrition.citation_generator._format_today", return_value="1 January 2025") as format_today:
+            first = self.citation_generator.generate_citation(self.sample_doc1)
+            second = self.citation_generator.generate_citation(self.sample_doc2)
+        
+        self.assertEqual(format_today.call_count, 1)
+        self.assertEqual(first.date_accessed, "1 January 2025")
+        self.assertIs(first.date_accessed, second.date_accessed)
 
 
 if __name__ == "__main__":
@@ -79,8 +79,8 @@ class TestCliEmbed:
         assert args[0] == self.text_file
         assert args[1] == 'test_collection'
     
-    @patch('wise_nutrition.cli.embed.asyncio.run')
-    def test_files_command_async_mode(self, mock_asyncio_run):
+    @patch('wise_nutrition.cli.embed._run_async')
+    def test_files_command_async_mode(self, mock_run_async):
         """Test the files command in async mode."""
         # Run command
         result = self.runner.invoke(embed, [
@@ -92,7 +92,9 @@ class TestCliEmbed:
         
         # Check result
         assert result.exit_code == 0
-        mock_asyncio_run.assert_called_once()
+        mock_run_async.assert_called_once()
+        # Close the coroutine the mock never awaited
+        mock_run_async.call_args[0][0].close()
     
     def test_process_text_file(self):
         """Test processing a text file."""
@@ -146,4 +148,17 @@ class TestCliEmbed:
         # Check that create_collection_sync was called because clear_existing=True
         mock_manager.create_collection_sync.assert_called_once()
         # Check that add_documents_sync was called with our test documents
-        mock_manager.add_documents_sync.assert_called_once_with(test_docs) 
\ No newline at end of file
+        mock_manager.add_documents_sync.assert_called_once_with(test_docs)
+    
+    @pytest.mark.asyncio
+    async def test_load_documents_reads_directory_concurrently(self):
+        """Test that the async loader returns every supported file's documents."""
+        from wise_nutrition.cli.embed import load_documents
+        
+        # Unsupported files are skipped
+        (Path(self.test_dir) / "notes.bin").write_bytes(b"\x00\x01")
+        
+        documents = await load_documents(Path(self.test_dir))
+        
+        chunk_ids = sorted(doc.metadata["chunk_id"] for doc in documents)
+        assert chunk_ids == ["file_test", "json_test_0"]
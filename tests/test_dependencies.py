@@ -0,0 +1,173 @@
+"""
+Tests for the FastAPI dependency factories.
+"""
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def dependencies():
+    """Import the dependencies module with the required configuration set."""
+    env = {
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "test-key"),
+        "WEAVIATE_URL": os.environ.get("WEAVIATE_URL", "http://localhost:8080"),
+        "WEAVIATE_API_KEY": os.environ.get("WEAVIATE_API_KEY", "test-key"),
+    }
+    with patch.dict(os.environ, env):
+        from wise_nutrition import dependencies
+        yield dependencies
+
+
+class TestBaseRetriever:
+    """Test how the base retriever is chosen while the vector store is built."""
+
+    def test_uses_vector_store_when_ready(self, dependencies):
+        """The cached vector store retriever is returned once no build is running."""
+        base, fallback = MagicMock(), MagicMock()
+        with patch.object(dependencies, "_base_retriever", return_value=base), \
+             patch.object(dependencies, "_fallback_retriever", return_value=fallback):
+            assert dependencies.get_base_retriever() is base
+
+    def test_fallback_retriever_works_offline(self, dependencies):
+        """The fallback embeds locally, so it answers without the OpenAI API."""
+        with patch.object(dependencies, "_embeddings", side_effect=RuntimeError("no network")):
+            documents = dependencies._fallback_retriever().invoke("vitamin D")
+
+        assert len(documents) == 4
+
+    def test_uses_fallback_when_build_fails(self, dependencies):
+        """A failed build falls back without caching the failure."""
+        base, fallback = MagicMock(), MagicMock()
+        build = MagicMock(side_effect=[RuntimeError("no network"), base])
+        with patch.object(dependencies, "_base_retriever", build), \
+             patch.object(dependencies, "_fallback_retriever", return_value=fallback):
+            assert dependencies.get_base_retriever() is fallback
+            assert dependencies.get_base_retriever() is base
+
+    def test_uses_fallback_while_building(self, dependencies):
+        """Requests get the fallback until the background build finishes."""
+        base, fallback = MagicMock(), MagicMock()
+        release = threading.Event()
+        with patch.object(dependencies, "_base_retriever", return_value=base), \
+             patch.object(dependencies, "_fallback_retriever", return_value=fallback), \
+             patch.object(dependencies, "warm_up_retriever", side_effect=lambda: release.wait(5)):
+            future = dependencies.start_vector_store_build()
+            assert dependencies.get_base_retriever() is fallback
+
+            release.set()
+            future.result(timeout=5)
+            assert dependencies.get_base_retriever() is base
+
+
+class TestRetrieverFactories:
+    """Test that dependency factories share one instance across requests."""
+
+    def test_factories_return_shared_instances(self, dependencies):
+        """Repeated dependency resolution reuses the built objects."""
+        dependencies._vector_store_building.set()
+        try:
+            assert dependencies.get_nutrition_retriever() is dependencies.get_nutrition_retriever()
+            assert dependencies.get_reranking_retriever() is dependencies.get_reranking_retriever()
+            assert dependencies.get_citation_generator() is dependencies.get_citation_generator()
+            assert dependencies.get_query_reformulator() is dependencies.get_query_reformulator()
+        finally:
+            dependencies._vector_store_building.clear()
+
+    def test_factories_switch_to_vector_store_when_ready(self, dependencies):
+        """Retrievers built over the fallback are replaced once the store is ready."""
+        dependencies._vector_store_building.set()
+        try:
+            during_build = dependencies.get_nutrition_retriever()
+        finally:
+            dependencies._vector_store_building.clear()
+
+        base = dependencies._fallback_retriever().model_copy()
+        with patch.object(dependencies, "_base_retriever", return_value=base):
+            ready = dependencies.get_nutrition_retriever()
+
+        assert ready is not during_build
+        assert ready.base_retriever is base
+
+    def test_chat_model_failure_is_not_cached(self, dependencies):
+        """A retriever is built with the real LLM once the chat model can be created."""
+        llm = dependencies.RunnablePassthrough()
+        dependencies._vector_store_building.set()
+        try:
+            with patch.object(dependencies, "_chat_model", side_effect=RuntimeError("no key")):
+                with pytest.raises(RuntimeError):
+                    dependencies.get_enhanced_retriever()
+            with patch.object(dependencies, "_chat_model", return_value=llm):
+                retriever = dependencies.get_enhanced_retriever()
+        finally:
+            dependencies._vector_store_building.clear()
+
+        assert retriever.query_reformulator.llm is llm
+
+
+class TestVectorStore:
+    """Test how the sample vector store is built and opened."""
+
+    def test_only_document_embeddings_are_cached(self, dependencies, tmp_path, monkeypatch):
+        """The store embeds queries with the plain model, so they stay out of the cache."""
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        class FakeEmbeddings(DeterministicFakeEmbedding):
+            model: str = "fake"
+
+        samples = tmp_path / "samples"
+        samples.mkdir()
+        (samples / "nutrition.txt").write_text("Vitamin C is in citrus.\n\nIron is in liver.\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(dependencies, "SAMPLES_DIR", samples)
+        monkeypatch.setattr(dependencies, "EMBEDDING_CACHE_DIR", tmp_path / "cache")
+        embeddings = FakeEmbeddings(size=16)
+
+        with patch.object(dependencies, "_embeddings", return_value=embeddings), \
+             patch.object(type(dependencies.config), "vector_backend", "chroma"):
+            store = dependencies._vector_store()
+
+        store.embeddings.embed_documents(["vitamin c", "iron"])
+        assert store.embeddings is embeddings
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+class TestSampleDocuments:
+    """Test rendering of the sample corpus entries."""
+
+    def test_vitamin_to_document(self, dependencies):
+        """Vitamin entries render one field per line."""
+        document = dependencies._vitamin_to_document({
+            "name": "Vitamin D",
+            "description": "Supports bone health",
+            "benefits": ["bones", "immunity"],
+            "food_sources": ["salmon", "eggs"],
+            "rda": {"adults": "600 IU"},
+            "deficiency_symptoms": ["fatigue"],
+        })
+
+        assert document.page_content == (
+            "Vitamin: Vitamin D\n"
+            "Description: Supports bone health\n"
+            "Benefits: bones, immunity\n"
+            "Food Sources: salmon, eggs\n"
+            "Recommended Daily Allowance:\n"
+            "  - adults: 600 IU\n"
+            "Deficiency Symptoms: fatigue"
+        )
+        assert document.metadata == {"source": "vitamins_sample", "type": "vitamin", "name": "Vitamin D"}
+
+    def test_recipe_to_document(self, dependencies):
+        """Missing recipe fields render as empty values."""
+        document = dependencies._recipe_to_document({"name": "Bone Broth", "ingredients": ["bones", "water"]})
+
+        assert document.page_content == (
+            "Recipe: Bone Broth\n"
+            "Description: \n"
+            "Ingredients: bones, water\n"
+            "Instructions: \n"
+            "Nutrition: "
+        )
+        assert document.metadata["type"] == "recipe"
@@ -1,6 +1,7 @@
 """
 Integration tests for the enhanced retriever with query reformulation.
 """
+import asyncio
 import unittest
 from unittest.mock import MagicMock, patch
 from typing import List
@@ -9,6 +10,8 @@ from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.language_models import BaseLLM
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
 
 from wise_nutrition.query_reformulation import QueryReformulator
 from wise_nutrition.enhanced_retriever import EnhancedNutritionRetriever
@@ -47,6 +50,26 @@ class MockBaseRetriever(BaseRetriever):
         return docs
 
 
+class CountingEmbeddings(Embeddings):
+    """Bag-of-letters embeddings that count how often they are called."""
+    
+    def __init__(self):
+        self.document_calls = 0
+        self.query_calls = 0
+    
+    def _embed(self, text):
+        text = text.lower()
+        return [float(text.count(letter)) + 0.1 for letter in "abcdefghijklmnopqrstuvwxyz"]
+    
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return [self._embed(text) for text in texts]
+    
+    def embed_query(self, text):
+        self.query_calls += 1
+        return self._embed(text)
+
+
 class TestEnhancedNutritionRetriever(unittest.TestCase):
     """Test the EnhancedNutritionRetriever class."""
     
@@ -118,6 +141,77 @@ How does vitamin C support overall health and wellness?"""
         self.assertTrue(any("vitamin c" in content.lower() for content in page_contents))
         self.assertFalse(any("citrus" in content.lower() for content in page_contents))
     
+    def test_async_matches_sync_retrieval(self):
+        """Test that the concurrent async path returns the same documents as the sync path."""
+        self.mock_llm.invoke.return_value = self.mock_llm.predict.return_value
+        query = "Tell me about vitamin C"
+        
+        sync_docs = self.enhanced_retriever.invoke(query)
+        async_docs = asyncio.run(self.enhanced_retriever.ainvoke(query))
+        
+        self.assertGreater(len(async_docs), 0)
+        self.assertEqual(
+            [doc.page_content for doc in async_docs],
+            [doc.page_content for doc in sync_docs]
+        )
+    
+    def test_runnable_uses_async_retrieval(self):
+        """Test that the runnable form of the retriever reaches the native async path."""
+        self.mock_llm.invoke.return_value = self.mock_llm.predict.return_value
+        runnable = self.enhanced_retriever.as_runnable()
+        
+        with patch.object(
+            EnhancedNutritionRetriever, "_aget_relevant_documents", autospec=True,
+            side_effect=EnhancedNutritionRetriever._aget_relevant_documents
+        ) as aretrieve:
+            docs = asyncio.run(runnable.ainvoke("Tell me about vitamin C"))
+        
+        aretrieve.assert_called_once()
+        self.assertGreater(len(docs), 0)
+    
+    def test_async_skips_original_query_when_excluded(self):
+        """Test that the async path doesn't fetch the original query when it won't be used."""
+        self.mock_llm.invoke.return_value = self.mock_llm.predict.return_value
+        self.query_reformulator.include_original = False
+        query = "Tell me about vitamin C"
+        
+        with patch.object(
+            MockBaseRetriever, "_get_relevant_documents", autospec=True,
+            side_effect=MockBaseRetriever._get_relevant_documents
+        ) as retrieve:
+            asyncio.run(self.enhanced_retriever.ainvoke(query))
+        
+        retrieved_queries = [call.args[1] for call in retrieve.call_args_list]
+        self.assertNotIn(query, retrieved_queries)
+        self.assertEqual(len(retrieved_queries), 4)
+    
+    def test_vector_store_queries_are_embedded_in_one_call(self):
+        """Test that all alternative queries share one embedding call on a vector store."""
+        self.mock_llm.invoke.return_value = self.mock_llm.predict.return_value
+        embeddings = CountingEmbeddings()
+        vector_store = InMemoryVectorStore.from_texts(
+            [
+                "Vitamin C is important for immune function.",
+                "Citrus fruits are rich in vitamin C.",
+                "Vitamins are essential for overall health.",
+            ],
+            embeddings
+        )
+        retriever = EnhancedNutritionRetriever(
+            base_retriever=vector_store.as_retriever(search_kwargs={"k": 2}),
+            query_reformulator=self.query_reformulator,
+            k=4,
+            max_queries=4
+        )
+        
+        for run in (retriever.invoke, lambda query: asyncio.run(retriever.ainvoke(query))):
+            embeddings.document_calls = embeddings.query_calls = 0
+            docs = run("Tell me about vitamin C")
+            
+            self.assertGreater(len(docs), 0)
+            self.assertEqual(embeddings.document_calls, 1)
+            self.assertEqual(embeddings.query_calls, 0)
+    
     def test_deduplicate_documents(self):
         """Test document deduplication."""
         # Create duplicate documents
@@ -91,6 +91,16 @@ class TestConversationMemoryManager:
         assert loaded_state.messages[0]["type"] == "system"
         assert loaded_state.messages[0]["content"] == "Test message"
     
+    def test_session_state_persists_to_disk(self):
+        """Test that saved state can be reloaded by a fresh manager."""
+        session_id = str(uuid4())
+        self.memory_manager.add_message(session_id, HumanMessage(content="Test message"))
+        
+        fresh_manager = ConversationMemoryManager(checkpoint_dir=self.temp_dir)
+        loaded_state = fresh_manager._load_session_state(session_id)
+        assert loaded_state.messages[-1]["content"] == "Test message"
+        assert isinstance(loaded_state.updated_at, datetime)
+    
     def test_get_chat_history(self):
         """Test getting chat history."""
         session_id = str(uuid4())
@@ -409,4 +419,22 @@ def test_delete_session():
     
     assert len(history.messages) == 1  # Only system message
     assert isinstance(history.messages[0], SystemMessage)
-    assert metadata == {} 
\ No newline at end of file
+    assert metadata == {} 
+
+def test_checkpoint_keys_cannot_escape_directory(tmp_path):
+    """Session ids that are not plain identifiers are never written to disk."""
+    checkpoint_dir = tmp_path / "checkpoints"
+    manager = ConversationMemoryManager(checkpoint_dir=str(checkpoint_dir))
+
+    state = manager.get_conversation_state("../escaped")
+    manager.save_conversation_state(state)
+
+    assert not (tmp_path / "escaped.json").exists()
+    assert list(checkpoint_dir.iterdir()) == []
+
+
+def test_default_checkpoint_dir_from_environment(checkpoint_dir):
+    """Without an explicit directory the manager uses CONVERSATION_CHECKPOINT_DIR."""
+    manager = ConversationMemoryManager()
+
+    assert manager.checkpoint_dir == str(checkpoint_dir)
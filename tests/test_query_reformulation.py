@@ -43,6 +43,7 @@ class TestQueryReformulator(unittest.TestCase):
         # Create a mock LLM for testing
         self.mock_llm = MagicMock(spec=BaseLLM)
         self.mock_llm.predict.return_value = "Query 1\nQuery 2\nQuery 3\nQuery 4"
+        self.mock_llm.invoke.return_value = "Query 1\nQuery 2\nQuery 3\nQuery 4"
         
         # Create a query reformulator with the mock LLM
         self.reformulator = QueryReformulator(llm=self.mock_llm)
@@ -72,6 +73,34 @@ class TestQueryReformulator(unittest.TestCase):
         self.assertIn("Query 3", result)
         self.assertIn("Query 4", result)
     
+    def test_rewrite_query_is_cached(self):
+        """Test that repeated queries reuse the earlier LLM result."""
+        query = "What are the benefits of vitamin C?"
+        first = self.reformulator.rewrite_query(query)
+        second = self.reformulator.rewrite_query(query)
+        
+        self.assertEqual(first, second)
+        self.mock_llm.invoke.assert_called_once()
+        
+        # Flipping include_original is applied on top of the cached result
+        self.reformulator.include_original = False
+        self.assertEqual(len(self.reformulator.rewrite_query(query)), 4)
+        self.mock_llm.invoke.assert_called_once()
+        
+        # Clearing the cache forces a new LLM call
+        self.reformulator.clear_cache()
+        self.reformulator.rewrite_query(query)
+        self.assertEqual(self.mock_llm.invoke.call_count, 2)
+    
+    def test_rewrite_query_strips_original(self):
+        """Test that the original query is deduplicated by its stripped form."""
+        self.mock_llm.invoke.return_value = "Query 1\nQuery 2"
+        self.reformulator.include_original = True
+        
+        result = self.reformulator.rewrite_query("  Query 1\n")
+        
+        self.assertEqual(result, ["Query 1", "Query 2"])
+    
     def test_as_runnable(self):
         """Test converting to a runnable lambda."""
         runnable = self.reformulator.as_runnable()
@@ -1,11 +1,16 @@
 """
 Tests for the RAG chain.
 """
+import asyncio
 import os
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 
-from wise_nutrition.rag_chain import NutritionRAGChain
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from wise_nutrition.rag_chain import NutritionRAGChain, RAGInput
 from wise_nutrition.memory import ConversationMemoryManager
 from langgraph.checkpoint.memory import MemorySaver
 
@@ -17,8 +22,9 @@ class TestNutritionRAGChain:
     
     def setup_method(self):
         """Set up the test environment."""
-        self.mock_retriever = MagicMock()
-        self.mock_llm = MagicMock()
+        # The chain validates these as Runnables, so plain mocks are rejected
+        self.mock_retriever = RunnableLambda(lambda query: [])
+        self.mock_llm = RunnableLambda(lambda messages: AIMessage(content="Test answer"))
         self.mock_memory_saver = MagicMock(spec=MemorySaver)
         self.mock_memory_manager = MagicMock(spec=ConversationMemoryManager)
         # Configure the memory manager to return our mock memory saver
@@ -75,14 +81,81 @@ class TestNutritionRAGChain:
         # Test build_chain here
     
     @pytest.mark.asyncio
-    async def test_invoke(self):
-        """Test invoking the RAG chain."""
-        # Setup
-        session_id = "test-session-id"
-        self.rag_chain.build_chain = MagicMock()
-        self.rag_chain.get_memory_key = MagicMock(return_value=f"test-memory-key-{session_id}")
-        mock_chain = MagicMock()
-        self.rag_chain.build_chain.return_value = mock_chain
-        mock_chain.invoke.return_value = {"answer": "Test answer", "sources": ["Test source"]}
-        
-        # Test invoke with session_id here 
\ No newline at end of file
+    async def test_invoke(self, tmp_path):
+        """Test invoking the RAG chain through the async entry point."""
+        from langchain_core.documents import Document
+        from langchain_core.messages import AIMessage
+        from langchain_core.runnables import RunnableLambda
+
+        docs = [Document(page_content="Vitamin D is made in the skin.", metadata={"source": "nih.gov"})]
+        chain = NutritionRAGChain(
+            retriever=RunnableLambda(lambda query: docs),
+            llm=RunnableLambda(lambda messages: AIMessage(content="Test answer")),
+            memory_manager=ConversationMemoryManager(checkpoint_dir=str(tmp_path))
+        )
+
+        result = await chain.ainvoke(RAGInput(query="What is vitamin D?", session_id="test-session-id"))
+
+        assert result["response"] == "Test answer"
+        assert result["session_id"] == "test-session-id"
+        assert result["sources"][0]["source"] == "nih.gov"
+        assert len(result["citations"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_does_not_block_event_loop(self, tmp_path):
+        """Concurrent ainvoke calls should overlap rather than run back to back."""
+        from langchain_core.messages import AIMessage
+        from langchain_core.runnables import RunnableLambda
+
+        delay = 0.05
+        concurrent_calls = 5
+
+        def slow_retriever(query):
+            time.sleep(delay)
+            return []
+
+        def slow_llm(messages):
+            time.sleep(delay)
+            return AIMessage(content="Test answer")
+
+        chain = NutritionRAGChain(
+            retriever=RunnableLambda(slow_retriever),
+            llm=RunnableLambda(slow_llm),
+            memory_manager=ConversationMemoryManager(checkpoint_dir=str(tmp_path))
+        )
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            chain.ainvoke(RAGInput(query="Test", session_id=f"session-{i}"))
+            for i in range(concurrent_calls)
+        ))
+        elapsed = time.perf_counter() - start
+
+        assert all(result["response"] == "Test answer" for result in results)
+        # Run back to back these calls would take concurrent_calls * 2 * delay
+        assert elapsed < concurrent_calls * 2 * delay
+
+    @pytest.mark.asyncio
+    async def test_astream_events_streams_llm_tokens(self, tmp_path):
+        """Streaming the chain should surface LLM tokens before the final output."""
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        from langchain_core.runnables import RunnableLambda
+
+        chain = NutritionRAGChain(
+            retriever=RunnableLambda(lambda query: []),
+            llm=GenericFakeChatModel(messages=iter([AIMessage(content="Vitamin D supports bones")])),
+            memory_manager=ConversationMemoryManager(checkpoint_dir=str(tmp_path))
+        )
+
+        tokens = []
+        final_output = None
+        async for event in chain.astream_events(RAGInput(query="Test", session_id="stream"), version="v1"):
+            if event["event"] == "on_chat_model_stream":
+                tokens.append(event["data"]["chunk"].content)
+            elif event["event"] == "on_chain_end" and event["name"] == "NutritionRAGChain":
+                final_output = event["data"]["output"]
+
+        assert len(tokens) > 1
+        assert "".join(tokens) == "Vitamin D supports bones"
+        assert final_output["response"] == "Vitamin D supports bones"
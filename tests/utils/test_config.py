@@ -1,86 +1,89 @@
 """
 Tests for the configuration module.
 """
-import os
 import pytest
-from unittest.mock import patch
 
 from wise_nutrition.utils.config import Config, ConfigurationError
 
+BASE_ENV = {
+    'OPENAI_API_KEY': 'test-key',
+    'ANTHROPIC_API_KEY': 'test-key',
+    'WEAVIATE_URL': 'test-url',
+    'WEAVIATE_API_KEY': 'test-key',
+    'WEAVIATE_COLLECTION_NAME': 'test-collection'
+}
+
+MODEL_ENV = {
+    'GOOGLE_API_KEY': 'test-key',
+    'OPENAI_MODEL_DEFAULT': 'gpt-3.5-turbo',
+    'ANTHROPIC_MODEL_DEFAULT': 'claude-3.5-sonnet-20240620',
+    'GOOGLE_MODEL_DEFAULT': 'gemini-2.0-flash-lite',
+    'OPENAI_MODEL_HIGH_PERFORMANCE': 'gpt-4o',
+    'ANTHROPIC_MODEL_HIGH_PERFORMANCE': 'claude-3-5-sonnet-20241022',
+    'GOOGLE_MODEL_HIGH_PERFORMANCE': 'gemini-2.0-flash'
+}
+
+
+@pytest.fixture
+def base_env(monkeypatch):
+    """Set the environment variables every valid configuration needs."""
+    for key, value in BASE_ENV.items():
+        monkeypatch.setenv(key, value)
+    return monkeypatch
+
+
+@pytest.fixture
+def config(base_env):
+    """A Config built from the base environment."""
+    base_env.setenv('CUSTOM_CONFIG', 'custom-value')
+    return Config()
+
+
 class TestConfig:
     """Test the Config class."""
-    
-    def test_required_env_variables(self):
+
+    def test_required_env_variables(self, base_env):
         """Test that required environment variables raise an error if missing."""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': '',
-            'WEAVIATE_URL': 'test-url',
-            'WEAVIATE_API_KEY': 'test-key',
-            'WEAVIATE_COLLECTION_NAME': 'test-collection'
-        }):
-            with pytest.raises(ConfigurationError) as exc_info:
-                Config()
-            assert "OPENAI_API_KEY" in str(exc_info.value)
-    
-    def test_optional_env_variables_default_values(self):
+        base_env.setenv('OPENAI_API_KEY', '')
+        with pytest.raises(ConfigurationError) as exc_info:
+            Config()
+        assert "OPENAI_API_KEY" in str(exc_info.value)
+
+    def test_optional_env_variables_default_values(self, base_env):
         """Test that optional environment variables have default values."""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test-key',
-            'ANTHROPIC_API_KEY': 'test-key',
-            'GOOGLE_API_KEY': 'test-key',
-            'WEAVIATE_URL': 'test-url',
-            'WEAVIATE_API_KEY': 'test-key',
-            'WEAVIATE_COLLECTION_NAME': 'test-collection',
-            'OPENAI_MODEL_DEFAULT': 'gpt-3.5-turbo',
-            'ANTHROPIC_MODEL_DEFAULT': 'claude-3.5-sonnet-20240620',
-            'GOOGLE_MODEL_DEFAULT': 'gemini-2.0-flash-lite',
-            'OPENAI_MODEL_HIGH_PERFORMANCE': 'gpt-4o',
-            'ANTHROPIC_MODEL_HIGH_PERFORMANCE': 'claude-3-5-sonnet-20241022',
-            'GOOGLE_MODEL_HIGH_PERFORMANCE': 'gemini-2.0-flash'
-        }):
-            config = Config()
-            assert config.google_api_key == "test-key"
-            assert config.openai_model_default == "gpt-3.5-turbo"
-            assert config.anthropic_model_default == "claude-3.5-sonnet-20240620"
-            assert config.google_model_default == "gemini-2.0-flash-lite"
-            assert config.openai_model_high_performance == "gpt-4o"
-            assert config.anthropic_model_high_performance == "claude-3-5-sonnet-20241022"
-            assert config.google_model_high_performance == "gemini-2.0-flash"
-    
-    def test_get_method_attribute_lookup(self):
-        """Test the get method attribute lookup."""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test-key',
-            'ANTHROPIC_API_KEY': 'test-key',
-            'WEAVIATE_URL': 'test-url',
-            'WEAVIATE_API_KEY': 'test-key',
-            'WEAVIATE_COLLECTION_NAME': 'test-collection'
-        }):
-            config = Config()
-            assert config.get("openai_api_key") == "test-key"
-    
-    def test_get_method_environment_lookup(self):
-        """Test the get method environment lookup."""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test-key',
-            'ANTHROPIC_API_KEY': 'test-key',
-            'WEAVIATE_URL': 'test-url',
-            'WEAVIATE_API_KEY': 'test-key',
-            'WEAVIATE_COLLECTION_NAME': 'test-collection',
-            'CUSTOM_CONFIG': 'custom-value'
-        }):
-            config = Config()
-            assert config.get("CUSTOM_CONFIG") == "custom-value"
-    
-    def test_get_method_default_value(self):
-        """Test the get method default value."""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test-key',
-            'ANTHROPIC_API_KEY': 'test-key',
-            'WEAVIATE_URL': 'test-url',
-            'WEAVIATE_API_KEY': 'test-key',
-            'WEAVIATE_COLLECTION_NAME': 'test-collection'
-        }):
-            config = Config()
-            assert config.get("MISSING_KEY", "default") == "default"
-    
\ No newline at end of file
+        for key, value in MODEL_ENV.items():
+            base_env.setenv(key, value)
+
+        config = Config()
+        assert config.google_api_key == "test-key"
+        assert config.openai_model_default == "gpt-3.5-turbo"
+        assert config.anthropic_model_default == "claude-3.5-sonnet-20240620"
+        assert config.google_model_default == "gemini-2.0-flash-lite"
+        assert config.openai_model_high_performance == "gpt-4o"
+        assert config.anthropic_model_high_performance == "claude-3-5-sonnet-20241022"
+        assert config.google_model_high_performance == "gemini-2.0-flash"
+
+    @pytest.mark.parametrize("key,default,expected", [
+        ("openai_api_key", None, "test-key"),       # attribute lookup
+        ("CUSTOM_CONFIG", None, "custom-value"),    # environment lookup
+        ("MISSING_KEY", "default", "default"),      # default value
+    ])
+    def test_get_method(self, config, key, default, expected):
+        """Test the get method lookup order."""
+        assert config.get(key, default) == expected
+
+    def test_get_does_not_expose_private_state(self, base_env):
+        """Test that get() only resolves public settings, never internal attributes."""
+        base_env.setenv('SECRET_TOKEN', 'secret')
+        base_env.delenv('ENV', raising=False)
+        config = Config()
+        assert config.get('env') is None
+        assert 'SECRET_TOKEN' not in config._env
+
+    def test_instance_is_shared(self, base_env):
+        """Test that Config.instance() reuses one instance until the cache is cleared."""
+        config = Config.instance()
+        assert Config.instance() is config
+
+        Config.instance.cache_clear()
+        assert Config.instance() is not config
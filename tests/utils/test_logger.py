@@ -0,0 +1,28 @@
+"""
+Tests for the logging utilities.
+"""
+import logging
+from logging.handlers import QueueHandler
+
+from wise_nutrition.utils.logger import start_queue_logging, stop_queue_logging
+
+
+class TestQueueLogging:
+    """Test the queue-based logging setup."""
+
+    def test_only_application_level_is_changed(self):
+        """Test that library loggers keep the root level."""
+        root = logging.getLogger()
+        app_logger = logging.getLogger("wise_nutrition")
+        root_level, app_level = root.level, app_logger.level
+
+        listener = start_queue_logging(logging.DEBUG)
+        try:
+            assert root.level == root_level
+            assert app_logger.getEffectiveLevel() == logging.DEBUG
+            assert not logging.getLogger("httpx").isEnabledFor(logging.DEBUG)
+        finally:
+            stop_queue_logging(listener)
+            app_logger.setLevel(app_level)
+
+        assert not any(isinstance(handler, QueueHandler) for handler in root.handlers)
@@ -0,0 +1,26 @@
+"""
+Tests for the shared text helpers.
+"""
+from wise_nutrition.utils.text import lowered, tokenize, token_set
+
+
+class TestText:
+    """Test the tokenization helpers."""
+
+    def test_tokenize_lowercases_and_splits_on_whitespace(self):
+        """Test that tokens are lowercase and keep the whitespace split semantics."""
+        assert tokenize("Vitamin C is found in  Oranges.") == (
+            "vitamin", "c", "is", "found", "in", "oranges."
+        )
+        assert lowered("Vitamin C") == "vitamin c"
+
+    def test_tokenize_is_cached(self):
+        """Test that repeated calls return the cached tuple."""
+        text = "Iron deficiency can lead to anemia"
+        assert tokenize(text) is tokenize(text)
+
+    def test_token_set(self):
+        """Test membership checks on the token set."""
+        tokens = token_set("Protein is found in meats and legumes")
+        assert "protein" in tokens
+        assert "meat" not in tokens
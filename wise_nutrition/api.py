@@ -2,45 +2,124 @@
 FastAPI main application using APIRouters.
 """
 import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+
+from wise_nutrition.dependencies import get_llm, close_shared_clients, start_vector_store_build
+from wise_nutrition.utils.config import Config
+from wise_nutrition.utils.logger import start_queue_logging, stop_queue_logging
 
 # Import routers directly
 from wise_nutrition.routers.health import router as health_router
-from wise_nutrition.routers.rag import router as rag_router
+from wise_nutrition.routers.rag import router as rag_router, add_langserve_routes
 from wise_nutrition.routers.auth import router as auth_router
 from wise_nutrition.routers.query_reformulation import router as query_reformulation_router
 from wise_nutrition.routers.recommendations import router as recommendations_router
 
-# --- FastAPI App Setup --- #
-app = FastAPI(
-    title="Wise Nutrition API",
-    description="A RAG-based nutrition advisor API with LangServe endpoints",
-    version="0.1.0"
-)
+# Largest request body accepted by the API
+MAX_REQUEST_BODY_BYTES = 64 * 1024
+
+# --- Lifespan --- #
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up shared resources before the first request is served, and release them on shutdown."""
+    log_listener = start_queue_logging()
+    # Build the cached chat model so the first request doesn't pay for it.
+    # The vector store is built in the background; until it is ready,
+    # requests use the fallback retriever.
+    get_llm()
+    start_vector_store_build()
+    yield
+    await close_shared_clients()
+    stop_queue_logging(log_listener)
+
+# --- Middleware --- #
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip responses, except streams.
+    
+    The gzip writer holds small chunks in its buffer until enough data has
+    accumulated, which would hold back streamed tokens.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "/stream" in scope["path"]:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"], # Allow all origins for simplicity, restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+class RequestBodyTooLarge(HTTPException):
+    """Raised while reading a request body that grows past the size limit."""
+    
+    def __init__(self, max_body: int):
+        super().__init__(status_code=413, detail=f"Request body exceeds {max_body} bytes")
 
-# --- Include Routers --- #
-app.include_router(health_router, tags=["Health"])
-# Include all API routers - no prefix here since they already have /api/v1 prefix
-app.include_router(rag_router, tags=["RAG Chain"])
-app.include_router(auth_router, tags=["Authentication"])
-app.include_router(query_reformulation_router, tags=["Query Reformulation"])
-# Include the recommendations router
-app.include_router(recommendations_router, prefix="/api/v1", tags=["Recommendations"])
+class BodySizeLimitMiddleware:
+    """
+    Reject requests whose body is larger than max_body bytes.
+    
+    A declared Content-Length over the limit gets a 413 before the body is
+    read. Bodies without one, such as chunked uploads, are counted as they
+    are received, and reading stops with a 413 once they pass the limit.
+    """
+    
+    def __init__(self, app, max_body: int):
+        self.app = app
+        self.max_body = max_body
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body:
+            await self._reject(scope, receive, send)
+            return
+        
+        received = 0
+        response_started = False
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    # An HTTPException, so FastAPI's body parsing re-raises it
+                    # as is and the exception handlers render the 413
+                    raise RequestBodyTooLarge(self.max_body)
+            return message
+        
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestBodyTooLarge:
+            if response_started:
+                raise
+            await self._reject(scope, receive, send)
+    
+    async def _reject(self, scope, receive, send):
+        response = ORJSONResponse(
+            {"detail": f"Request body exceeds {self.max_body} bytes"},
+            status_code=413,
+        )
+        await response(scope, receive, send)
 
 # --- Root Endpoint --- #
-@app.get("/")
 async def root():
     """Root endpoint providing basic info and link to docs/playground."""
     return {
@@ -52,6 +131,61 @@ async def root():
         "recommendations": "/api/v1/recommendations"
     }
 
+# --- FastAPI App Setup --- #
+@lru_cache(maxsize=1)
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+    
+    The app is memoized, so middleware and routers are registered exactly
+    once per process no matter how many times this is called.
+    
+    Returns:
+        The configured FastAPI application
+    """
+    app = FastAPI(
+        title="Wise Nutrition API",
+        description="A RAG-based nutrition advisor API with LangServe endpoints",
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
+    )
+    
+    # Add CORS middleware; CORS_ALLOW_ORIGINS is a comma-separated allowlist
+    allow_origins = [
+        origin.strip()
+        for origin in Config.instance().get("cors_allow_origins", "*").split(",")
+        if origin.strip()
+    ]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allow_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Requests are small JSON documents; refuse anything far larger up front
+    app.add_middleware(BodySizeLimitMiddleware, max_body=MAX_REQUEST_BODY_BYTES)
+    
+    # Compress larger JSON bodies such as source lists; small ones aren't worth it
+    app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024)
+    
+    # --- Include Routers --- #
+    app.include_router(health_router, tags=["Health"])
+    # Include all API routers - no prefix here since they already have /api/v1 prefix
+    app.include_router(rag_router, tags=["RAG Chain"])
+    app.include_router(auth_router, tags=["Authentication"])
+    app.include_router(query_reformulation_router, tags=["Query Reformulation"])
+    app.include_router(recommendations_router, tags=["Recommendations"])
+    add_langserve_routes(app)
+    
+    app.add_api_route("/", root, methods=["GET"])
+    
+    return app
+
+app = create_app()
+
 # --- Custom Exception Handlers (Example Placeholder) --- #
 # You can add custom handlers to catch specific exceptions from your
 # chain or dependencies and return standardized error responses.
@@ -84,4 +218,4 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     # Use reload=True for development
-    uvicorn.run("wise_nutrition.api:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("wise_nutrition.api:create_app", factory=True, host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -3,34 +3,126 @@ Firebase authentication and user management module.
 """
 import os
 import json
-from typing import Dict, Any, Optional
+import logging
+import hashlib
+import time
+from collections import OrderedDict
+from functools import cache
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from uuid import UUID, uuid4
+from uuid import uuid4
 
 import firebase_admin
 from firebase_admin import auth, credentials
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 
 from wise_nutrition.models.user import UserCreate, UserResponse, UserInDB, Token, TokenData, UserLogin
+from wise_nutrition.utils.config import ensure_env_loaded
 
-# Check if we're in development mode
-DEV_MODE = os.environ.get("WISE_NUTRITION_DEV_MODE", "true").lower() == "true"
+logger = logging.getLogger(__name__)
 
-# Initialize Firebase with credentials if not in dev mode
-if not DEV_MODE:
+# Upper bound for a single Firebase Admin HTTP request, so a slow backend fails fast
+# instead of holding a threadpool worker
+FIREBASE_HTTP_TIMEOUT_SECONDS = 5
+
+@cache
+def is_dev_mode() -> bool:
+    """
+    Check whether mock authentication is enabled, reading the setting once.
+    
+    Returns:
+        True if WISE_NUTRITION_DEV_MODE is "true" (the default)
+    """
+    ensure_env_loaded()
+    dev_mode = os.environ.get("WISE_NUTRITION_DEV_MODE", "true").lower() == "true"
+    if dev_mode:
+        logger.warning("Running in DEVELOPMENT MODE - using mock authentication")
+    return dev_mode
+
+@cache
+def get_firebase_app() -> firebase_admin.App:
+    """
+    Get the default Firebase app, initializing it on first use.
+    
+    Returns:
+        The Firebase app used by the auth calls
+        
+    Raises:
+        FileNotFoundError: If the app must be initialized and no credentials file exists
+    """
+    try:
+        return firebase_admin.get_app()
+    except ValueError:
+        pass
+    
     cred_path = os.path.join(os.getcwd(), "firebase_credentials.json")
-    if os.path.exists(cred_path):
-        cred = credentials.Certificate(cred_path)
-        firebase_app = firebase_admin.initialize_app(cred)
-    else:
+    if not os.path.exists(cred_path):
         raise FileNotFoundError(f"Firebase credentials file not found at {cred_path}")
-else:
-    print("⚠️ Running in DEVELOPMENT MODE - using mock authentication ⚠️")
+    return firebase_admin.initialize_app(
+        credentials.Certificate(cred_path),
+        options={"httpTimeout": FIREBASE_HTTP_TIMEOUT_SECONDS},
+    )
+
+async def _call_firebase(func, *args, **kwargs):
+    """Run a blocking Firebase Admin call in the threadpool once the app is initialized."""
+    get_firebase_app()
+    return await run_in_threadpool(func, *args, **kwargs)
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Same scheme for the request-level dependency, which must not demand a token in dev mode
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
+
+# Verified tokens are trusted for at most this long, and never past their own expiry
+TOKEN_CACHE_TTL_SECONDS = 300
+TOKEN_CACHE_MAX_SIZE = 10_000
+
+# Token hash -> (expiry timestamp, user), least recently used first
+_token_cache: "OrderedDict[bytes, Tuple[float, UserResponse]]" = OrderedDict()
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash a token so raw credentials are never kept in memory as cache keys."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _get_cached_user(key: bytes) -> Optional[UserResponse]:
+    """
+    Look up the user for a previously verified token.
+    
+    Args:
+        key: Token cache key
+        
+    Returns:
+        The cached user, or None if the token is unknown or expired
+    """
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+    
+    expires_at, user = entry
+    if expires_at <= time.time():
+        del _token_cache[key]
+        return None
+    
+    _token_cache.move_to_end(key)
+    return user
+
+def _cache_user(key: bytes, user: UserResponse, token_expiry: float) -> None:
+    """
+    Remember the user for a verified token.
+    
+    Args:
+        key: Token cache key
+        user: The user the token belongs to
+        token_expiry: The token's own expiry timestamp
+    """
+    _token_cache[key] = (min(token_expiry, time.time() + TOKEN_CACHE_TTL_SECONDS), user)
+    _token_cache.move_to_end(key)
+    while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+        _token_cache.popitem(last=False)
+
 class FirebaseAuthManager:
     """Handles Firebase authentication and user management."""
     
@@ -50,7 +142,8 @@ class FirebaseAuthManager:
         """
         try:
             # Create the user in Firebase Authentication
-            firebase_user = auth.create_user(
+            firebase_user = await _call_firebase(
+                auth.create_user,
                 email=user_data.email,
                 password=user_data.password,
                 display_name=user_data.full_name or "",
@@ -59,7 +152,7 @@ class FirebaseAuthManager:
             
             # Convert to our application's user model
             user_response = UserResponse(
-                id=UUID(firebase_user.uid),
+                id=firebase_user.uid,
                 email=firebase_user.email,
                 full_name=firebase_user.display_name,
                 is_active=not firebase_user.disabled,
@@ -84,7 +177,7 @@ class FirebaseAuthManager:
                 )
             else:
                 # Log the full error for debugging
-                print(f"Firebase error: {error_message}")
+                logger.exception("Firebase error during user creation")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Failed to create user"
@@ -108,11 +201,11 @@ class FirebaseAuthManager:
             # We can't directly authenticate with Firebase Admin SDK
             # In a real application, you would use Firebase Auth REST API
             # For this example, we'll verify the user exists and return a custom token
-            user = auth.get_user_by_email(user_credentials.email)
+            user = await _call_firebase(auth.get_user_by_email, user_credentials.email)
             
             # In production, you'd use Firebase Auth REST API to verify password
             # This is a simplification for demo purposes
-            custom_token = auth.create_custom_token(user.uid)
+            custom_token = await _call_firebase(auth.create_custom_token, user.uid)
             
             # Convert bytes to string if needed
             if isinstance(custom_token, bytes):
@@ -138,7 +231,7 @@ class FirebaseAuthManager:
                 )
             else:
                 # Log the full error for debugging
-                print(f"Firebase error during authentication: {error_message}")
+                logger.exception("Firebase error during authentication")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Authentication failed"
@@ -164,16 +257,22 @@ class FirebaseAuthManager:
             headers={"WWW-Authenticate": "Bearer"},
         )
         
+        # Skip signature verification and the user lookup for recently seen tokens
+        cache_key = _token_cache_key(token)
+        cached_user = _get_cached_user(cache_key)
+        if cached_user is not None:
+            return cached_user
+        
         try:
             # Verify Firebase token
-            decoded_token = auth.verify_id_token(token)
+            decoded_token = await _call_firebase(auth.verify_id_token, token)
             
             # Get user details
-            firebase_user = auth.get_user(decoded_token["uid"])
+            firebase_user = await _call_firebase(auth.get_user, decoded_token["uid"])
             
             # Convert to our application's user model
             user = UserResponse(
-                id=UUID(firebase_user.uid),
+                id=firebase_user.uid,
                 email=firebase_user.email,
                 full_name=firebase_user.display_name,
                 is_active=not firebase_user.disabled,
@@ -181,10 +280,11 @@ class FirebaseAuthManager:
                 last_login=datetime.utcfromtimestamp(firebase_user.user_metadata.last_refresh_timestamp / 1000) if firebase_user.user_metadata.last_refresh_timestamp else None
             )
             
+            _cache_user(cache_key, user, decoded_token.get("exp", 0))
             return user
             
         except Exception as e:
-            print(f"Token validation error: {str(e)}")
+            logger.warning("Token validation error: %s", e)
             raise credentials_exception
     
     @staticmethod
@@ -206,7 +306,7 @@ class FirebaseAuthManager:
         return current_user
     
     @staticmethod
-    async def update_user(user_id: UUID, update_data: Dict[str, Any]) -> UserResponse:
+    async def update_user(user_id: str, update_data: Dict[str, Any]) -> UserResponse:
         """
         Update a user in Firebase.
         
@@ -237,11 +337,11 @@ class FirebaseAuthManager:
                 update_args["password"] = update_data["password"]
             
             # Update user in Firebase
-            firebase_user = auth.update_user(str(user_id), **update_args)
+            firebase_user = await _call_firebase(auth.update_user, user_id, **update_args)
             
             # Convert to our application's user model
             user_response = UserResponse(
-                id=UUID(firebase_user.uid),
+                id=firebase_user.uid,
                 email=firebase_user.email,
                 full_name=firebase_user.display_name,
                 is_active=not firebase_user.disabled,
@@ -261,14 +361,14 @@ class FirebaseAuthManager:
                 )
             else:
                 # Log the full error for debugging
-                print(f"Firebase error during user update: {error_message}")
+                logger.exception("Firebase error during user update")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Failed to update user"
                 )
     
     @staticmethod
-    async def delete_user(user_id: UUID) -> None:
+    async def delete_user(user_id: str) -> None:
         """
         Delete a user from Firebase.
         
@@ -279,7 +379,7 @@ class FirebaseAuthManager:
             HTTPException: If deletion fails
         """
         try:
-            auth.delete_user(str(user_id))
+            await _call_firebase(auth.delete_user, user_id)
         except firebase_admin.exceptions.FirebaseError as e:
             # Handle Firebase-specific errors
             error_message = str(e)
@@ -290,7 +390,7 @@ class FirebaseAuthManager:
                 )
             else:
                 # Log the full error for debugging
-                print(f"Firebase error during user deletion: {error_message}")
+                logger.exception("Firebase error during user deletion")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Failed to delete user"
@@ -311,11 +411,11 @@ class FirebaseAuthManager:
             # In Firebase Admin SDK, we can't directly send password reset emails
             # In a real application, you would use Firebase Auth REST API
             # For this example, we'll just verify the user exists
-            auth.get_user_by_email(email)
+            await _call_firebase(auth.get_user_by_email, email)
             
             # In production, you'd call Firebase Auth REST API here
             # This is a placeholder
-            print(f"Password reset email would be sent to {email}")
+            logger.info("Password reset email would be sent to %s", email)
             
         except firebase_admin.exceptions.FirebaseError as e:
             # Handle Firebase-specific errors
@@ -325,7 +425,7 @@ class FirebaseAuthManager:
                 pass
             else:
                 # Log the full error for debugging
-                print(f"Firebase error when sending reset email: {error_message}")
+                logger.exception("Firebase error when sending reset email")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Failed to process password reset request"
@@ -350,7 +450,7 @@ class FirebaseAuthManager:
             # In Firebase Admin SDK, we can't directly verify emails
             # In a real application, you would use Firebase Auth REST API
             # For this example, we'll just verify the user exists
-            user = auth.get_user_by_email(email)
+            user = await _call_firebase(auth.get_user_by_email, email)
             
             # In production, you'd call Firebase Auth REST API here
             # This is a placeholder - always returns True for demo
@@ -366,7 +466,7 @@ class FirebaseAuthManager:
                 )
             else:
                 # Log the full error for debugging
-                print(f"Firebase error during email verification: {error_message}")
+                logger.exception("Firebase error during email verification")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Failed to verify email"
@@ -384,7 +484,7 @@ def get_firebase_auth_manager():
 async def get_mock_user() -> UserResponse:
     """Return a mock user for development purposes."""
     return UserResponse(
-        id=uuid4(),
+        id=str(uuid4()),
         email="dev@example.com",
         full_name="Development User",
         is_active=True,
@@ -392,12 +492,42 @@ async def get_mock_user() -> UserResponse:
         last_login=datetime.now()
     )
 
-# Auth dependencies - use mock in dev mode
-if DEV_MODE:
-    # In development mode, always return the mock user
-    get_current_user = get_mock_user
-    get_current_active_user = get_mock_user
-else:
-    # In production, use the real Firebase authentication
-    get_current_user = FirebaseAuthManager.get_current_user
-    get_current_active_user = FirebaseAuthManager.get_current_active_user
\ No newline at end of file
+# --- Auth dependencies --- #
+
+async def get_current_user(token: Optional[str] = Depends(optional_oauth2_scheme)) -> UserResponse:
+    """
+    Resolve the user for a request: a mock user in dev mode, otherwise the Firebase user.
+    
+    Args:
+        token: Bearer token, if one was sent
+        
+    Returns:
+        Current user data
+        
+    Raises:
+        HTTPException: If no valid token was sent outside dev mode
+    """
+    if is_dev_mode():
+        return await get_mock_user()
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await FirebaseAuthManager.get_current_user(token)
+
+async def get_current_active_user(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+    """
+    Resolve the current user and require the account to be active.
+    
+    Args:
+        current_user: Current authenticated user
+        
+    Returns:
+        Current active user
+        
+    Raises:
+        HTTPException: If user is inactive
+    """
+    return await FirebaseAuthManager.get_current_active_user(current_user)
@@ -5,25 +5,74 @@ This module provides functionality for generating properly formatted citations
 from retrieved documents, allowing the RAG system to provide source information
 for its responses.
 """
-from typing import List, Dict, Any, Optional
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from langchain_core.documents import Document
 from langchain_core.runnables import RunnableLambda
 
 
-class Citation(BaseModel):
-    """Represents a formatted citation from a source document."""
+def _format_today() -> str:
+    """Format today's date the way citations show access dates."""
+    return sys.intern(datetime.now().strftime("%d %B %Y"))
+
+
+# How long a formatted access date is reused before the clock is read again
+DATE_CACHE_TTL_SECONDS = 60
+
+# Citation text templates per style, one per combination of optional parts,
+# indexed by _template_index
+_CITATION_TEMPLATES: Dict[str, Tuple[Callable[[str, Optional[str], Optional[str]], str], ...]] = {
+    "mla": (
+        lambda s, u, d: f'"{s}".',
+        lambda s, u, d: f'"{s}", Accessed {d}.',
+        lambda s, u, d: f'"{s}", {u}.',
+        lambda s, u, d: f'"{s}", {u}, Accessed {d}.',
+    ),
+    "apa": (
+        lambda s, u, d: f"{s}.",
+        lambda s, u, d: f"{s} on {d}.",
+        lambda s, u, d: f"{s}. Retrieved from {u}.",
+        lambda s, u, d: f"{s}. Retrieved from {u} on {d}.",
+    ),
+    "chicago": (
+        lambda s, u, d: f'"{s}".',
+        lambda s, u, d: f'"{s}", accessed {d}.',
+        lambda s, u, d: f'"{s}", {u}.',
+        lambda s, u, d: f'"{s}", {u}, accessed {d}.',
+    ),
+}
+
+
+def _template_index(source_url: Optional[str], date_accessed: Optional[str]) -> int:
+    """Pick the template for the parts present: bit 1 is the URL, bit 0 the date."""
+    return bool(source_url) << 1 | bool(date_accessed)
+
+
+def _interned(value: Any) -> Any:
+    """Intern string metadata values; chunks of one file repeat the same source."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class Citation:
+    """
+    Represents a formatted citation from a source document.
     
-    text: str = Field(..., description="The formatted citation text")
-    source_name: Optional[str] = Field(None, description="Name of the source")
-    source_url: Optional[str] = Field(None, description="URL of the source")
-    date_accessed: Optional[str] = Field(None, description="Date the source was accessed")
-    original_content: Optional[str] = Field(None, description="Original content from the document")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+    Citations are built internally and flattened to dicts for API output, so
+    this is a plain slotted dataclass rather than a validated model.
+    """
     
-    model_config = {"arbitrary_types_allowed": True}
+    text: str  # The formatted citation text
+    source_name: Optional[str] = None  # Name of the source
+    source_url: Optional[str] = None  # URL of the source
+    date_accessed: Optional[str] = None  # Date the source was accessed
+    original_content: Optional[str] = None  # Original content from the document
+    metadata: Dict[str, Any] = field(default_factory=dict)  # Additional metadata
     
     def to_display_format(self, style: str = "mla") -> str:
         """
@@ -35,14 +84,8 @@ class Citation(BaseModel):
         Returns:
             Formatted citation string
         """
-        if style == "mla":
-            return self._to_mla_format()
-        elif style == "apa":
-            return self._to_apa_format()
-        elif style == "chicago":
-            return self._to_chicago_format()
-        else:
-            return self.text
+        formatter = self._STYLE_FORMATTERS.get(style)
+        return formatter(self) if formatter else self.text
     
     def _to_mla_format(self) -> str:
         """Format citation in MLA style."""
@@ -50,29 +93,39 @@ class Citation(BaseModel):
         if self.text and "Accessed" in self.text:
             return self.text
             
-        source = self.source_name or "Unknown Source"
-        url = f", {self.source_url}" if self.source_url else ""
-        date = f", Accessed {self.date_accessed}" if self.date_accessed else ""
-        
-        return f'"{source}"{url}{date}.'
+        return "".join((
+            f'"{self.source_name or "Unknown Source"}"',
+            f", {self.source_url}" if self.source_url else "",
+            f", Accessed {self.date_accessed}" if self.date_accessed else "",
+            ".",
+        ))
     
     def _to_apa_format(self) -> str:
         """Format citation in APA style."""
         # Don't use pre-set text for other formats
-        source = self.source_name or "Unknown Source"
-        url = f". Retrieved from {self.source_url}" if self.source_url else ""
-        date = f" on {self.date_accessed}" if self.date_accessed else ""
-        
-        return f"{source}{url}{date}."
+        return "".join((
+            self.source_name or "Unknown Source",
+            f". Retrieved from {self.source_url}" if self.source_url else "",
+            f" on {self.date_accessed}" if self.date_accessed else "",
+            ".",
+        ))
     
     def _to_chicago_format(self) -> str:
         """Format citation in Chicago style."""
         # Don't use pre-set text for other formats
-        source = self.source_name or "Unknown Source"
-        url = f", {self.source_url}" if self.source_url else ""
-        date = f", accessed {self.date_accessed.lower()}" if self.date_accessed else ""
-        
-        return f'"{source}"{url}{date}.'
+        return "".join((
+            f'"{self.source_name or "Unknown Source"}"',
+            f", {self.source_url}" if self.source_url else "",
+            f", accessed {self.date_accessed.lower()}" if self.date_accessed else "",
+            ".",
+        ))
+    
+    # Style name -> formatter, so rendering is one dict lookup
+    _STYLE_FORMATTERS: ClassVar[Dict[str, Callable[["Citation"], str]]] = {
+        "mla": _to_mla_format,
+        "apa": _to_apa_format,
+        "chicago": _to_chicago_format,
+    }
 
 
 class CitationGenerator(BaseModel):
@@ -85,6 +138,9 @@ class CitationGenerator(BaseModel):
     
     default_style: str = Field(default="mla", description="Default citation style")
     
+    # (monotonic time, formatted date) of the last access-date lookup
+    _cached_date: Optional[Tuple[float, str]] = PrivateAttr(default=None)
+    
     model_config = {"arbitrary_types_allowed": True}
     
     def generate_citation(self, document: Document) -> Citation:
@@ -94,35 +150,60 @@ class CitationGenerator(BaseModel):
         Args:
             document: The document to generate a citation for
             
+        Returns:
+            A Citation object
+        """
+        return self._make_citation(document, self._today(), self._style_builder())
+    
+    def _today(self) -> str:
+        """
+        Get the formatted access date, reformatting it at most once per DATE_CACHE_TTL_SECONDS.
+        
+        Returns:
+            Today's date as shown in citations
+        """
+        now = time.monotonic()
+        cached = self._cached_date
+        if cached is None or now - cached[0] > DATE_CACHE_TTL_SECONDS:
+            cached = (now, _format_today())
+            self._cached_date = cached
+        return cached[1]
+    
+    def _style_builder(self) -> Callable[[str, Optional[str], Optional[str]], str]:
+        """Resolve the citation builder for the default style (MLA unless apa/chicago)."""
+        if self.default_style == "apa":
+            return self._build_apa_citation
+        if self.default_style == "chicago":
+            return self._build_chicago_citation
+        return self._build_mla_citation
+    
+    @staticmethod
+    def _make_citation(document: Document, date_accessed: str, builder: Callable[[str, Optional[str], Optional[str]], str]) -> Citation:
+        """
+        Build a Citation for a document with an already resolved date and style.
+        
+        Args:
+            document: The document to generate a citation for
+            date_accessed: Formatted access date
+            builder: Style-specific citation text builder
+            
         Returns:
             A Citation object
         """
         # Extract metadata
-        metadata = document.metadata if hasattr(document, "metadata") else {}
+        metadata = document.metadata
         
         # Get source information
-        source_name = metadata.get("source") or metadata.get("name") or "Unknown Source"
-        source_url = metadata.get("url") or None
-        
-        # Set access date to today
-        date_accessed = datetime.now().strftime("%d %B %Y")
+        source_name = _interned(metadata.get("source") or metadata.get("name") or "Unknown Source")
+        source_url = _interned(metadata.get("url") or None)
         
         # Extract a snippet of the original content
-        original_content = document.page_content if hasattr(document, "page_content") else None
-        if original_content and len(original_content) > 100:
-            original_content = original_content[:97] + "..."
-        
-        # Build the formatted citation text based on the default style
-        if self.default_style == "apa":
-            citation_text = self._build_apa_citation(source_name, source_url, date_accessed, metadata)
-        elif self.default_style == "chicago":
-            citation_text = self._build_chicago_citation(source_name, source_url, date_accessed, metadata)
-        else:  # Default to MLA
-            citation_text = self._build_mla_citation(source_name, source_url, date_accessed, metadata)
+        original_content = document.page_content
+        if len(original_content) > 100:
+            original_content = f"{original_content[:97]}..."
         
-        # Create and return the Citation object
         return Citation(
-            text=citation_text,
+            text=builder(source_name, source_url, date_accessed),
             source_name=source_name,
             source_url=source_url,
             date_accessed=date_accessed,
@@ -134,44 +215,40 @@ class CitationGenerator(BaseModel):
         self,
         source_name: str,
         source_url: Optional[str] = None,
-        date_accessed: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        date_accessed: Optional[str] = None
     ) -> str:
         """Build an MLA-style citation."""
-        url_part = f", {source_url}" if source_url else ""
-        date_part = f", Accessed {date_accessed}" if date_accessed else ""
-        return f'"{source_name}"{url_part}{date_part}.'
+        return _CITATION_TEMPLATES["mla"][_template_index(source_url, date_accessed)](
+            source_name, source_url, date_accessed
+        )
     
     def _build_apa_citation(
         self,
         source_name: str,
         source_url: Optional[str] = None,
-        date_accessed: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        date_accessed: Optional[str] = None
     ) -> str:
         """Build an APA-style citation."""
-        url_part = f". Retrieved from {source_url}" if source_url else ""
-        date_part = f" on {date_accessed}" if date_accessed else ""
-        return f"{source_name}{url_part}{date_part}."
+        return _CITATION_TEMPLATES["apa"][_template_index(source_url, date_accessed)](
+            source_name, source_url, date_accessed
+        )
     
     def _build_chicago_citation(
         self,
         source_name: str,
         source_url: Optional[str] = None,
-        date_accessed: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        date_accessed: Optional[str] = None
     ) -> str:
         """Build a Chicago-style citation."""
-        url_part = f", {source_url}" if source_url else ""
-        date_part = f", accessed {date_accessed}" if date_accessed else ""
-        return f'"{source_name}"{url_part}{date_part}.'
+        return _CITATION_TEMPLATES["chicago"][_template_index(source_url, date_accessed)](
+            source_name, source_url, date_accessed
+        )
     
     def _build_citation_text(
         self,
         source_name: str,
         source_url: Optional[str] = None,
-        date_accessed: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        date_accessed: Optional[str] = None
     ) -> str:
         """
         Build a formatted citation text string based on the default style.
@@ -180,17 +257,11 @@ class CitationGenerator(BaseModel):
             source_name: Name of the source
             source_url: URL of the source
             date_accessed: Date the source was accessed
-            metadata: Additional metadata
             
         Returns:
             Formatted citation text
         """
-        if self.default_style == "apa":
-            return self._build_apa_citation(source_name, source_url, date_accessed, metadata)
-        elif self.default_style == "chicago":
-            return self._build_chicago_citation(source_name, source_url, date_accessed, metadata)
-        else:  # Default to MLA
-            return self._build_mla_citation(source_name, source_url, date_accessed, metadata)
+        return self._style_builder()(source_name, source_url, date_accessed)
     
     def generate_citations(self, documents: List[Document]) -> List[Citation]:
         """
@@ -202,7 +273,10 @@ class CitationGenerator(BaseModel):
         Returns:
             List of Citation objects
         """
-        return [self.generate_citation(doc) for doc in documents]
+        # Resolve the date and the style once for the whole batch
+        date_accessed = self._today()
+        builder = self._style_builder()
+        return [self._make_citation(doc, date_accessed, builder) for doc in documents]
     
     def as_runnable(self) -> RunnableLambda:
         """Convert this citation generator to a runnable lambda."""
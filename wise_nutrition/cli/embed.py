@@ -4,15 +4,44 @@ CLI command for embedding files into ChromaDB.
 import os
 import click
 import asyncio
-from typing import List, Optional
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, BinaryIO, Callable, Coroutine, Dict, List, Optional, TypeVar
 from pathlib import Path
 
 from langchain_core.documents import Document
 from wise_nutrition.utils.config import Config
 from wise_nutrition.embeddings.chroma_embedding_manager import ChromaEmbeddingManager
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+T = TypeVar("T")
+
 # TODO: Bugfix this file in regards to actual data. Also unify the data in regards to the fields as much as possible!
 
+# Upper bound on files open at once when loading a directory asynchronously
+MAX_CONCURRENT_FILE_READS = 32
+
+# Smallest directory load_documents_sync parses in a process pool; below this,
+# starting the workers costs more than it saves
+PROCESS_POOL_MIN_FILES = 16
+
+# Fields _extract_content_from_dict places first, in output order (a name
+# precedes a title), followed by the fields that make up the body text
+HEADER_FIELDS = ("name", "title")
+BODY_FIELDS = ("description", "text", "body", "summary", "info", "details", "instructions")
+
 @click.group()
 def embed():
     """Embed files into ChromaDB collections."""
@@ -33,16 +62,43 @@ def files(file_path: Path, collection_name: Optional[str], persist_dir: Optional
     FILE_PATH can be a single file or directory containing files to embed.
     """
     if async_mode:
-        asyncio.run(_embed_files_async(file_path, collection_name, persist_dir, clear_existing))
+        _run_async(_embed_files_async(file_path, collection_name, persist_dir, clear_existing))
     else:
         _embed_files_sync(file_path, collection_name, persist_dir, clear_existing)
 
 
+@lru_cache(maxsize=8)
+def _get_manager(collection_name: str, persist_dir: str) -> ChromaEmbeddingManager:
+    """
+    Get the embedding manager for a collection, reusing it within the process.
+    
+    Args:
+        collection_name: Name of the collection
+        persist_dir: Directory the collection is persisted in
+        
+    Returns:
+        The ChromaEmbeddingManager for that collection
+    """
+    return ChromaEmbeddingManager(
+        config=Config.instance(),
+        collection_name=collection_name,
+        persist_directory=persist_dir
+    )
+
+
+def _run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion, on a uvloop event loop when uvloop is installed."""
+    if UVLOOP_AVAILABLE:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
+
+
 async def _embed_files_async(file_path: Path, collection_name: Optional[str], 
                             persist_dir: Optional[str], clear_existing: bool):
     """Async implementation of file embedding."""
     # Set up embedding manager
-    config = Config()
+    config = Config.instance()
     
     # Override defaults if specified
     if collection_name:
@@ -57,12 +113,8 @@ async def _embed_files_async(file_path: Path, collection_name: Optional[str],
         persist_dir = config.chroma_persist_directory
         click.echo(f"Using default persist directory: {persist_dir}")
     
-    # Create embedding manager
-    embedding_manager = ChromaEmbeddingManager(
-        config=config,
-        collection_name=collection_name,
-        persist_directory=persist_dir
-    )
+    # Get the embedding manager for this collection
+    embedding_manager = _get_manager(collection_name, persist_dir)
     
     # Create or reset collection if needed
     if clear_existing:
@@ -83,7 +135,7 @@ def _embed_files_sync(file_path: Path, collection_name: Optional[str],
                      persist_dir: Optional[str], clear_existing: bool):
     """Sync implementation of file embedding."""
     # Set up embedding manager
-    config = Config()
+    config = Config.instance()
     
     # Override defaults if specified
     if collection_name:
@@ -98,12 +150,8 @@ def _embed_files_sync(file_path: Path, collection_name: Optional[str],
         persist_dir = config.chroma_persist_directory
         click.echo(f"Using default persist directory: {persist_dir}")
     
-    # Create embedding manager
-    embedding_manager = ChromaEmbeddingManager(
-        config=config,
-        collection_name=collection_name,
-        persist_directory=persist_dir
-    )
+    # Get the embedding manager for this collection
+    embedding_manager = _get_manager(collection_name, persist_dir)
     
     # Create or reset collection if needed
     if clear_existing:
@@ -124,17 +172,30 @@ async def load_documents(file_path: Path) -> List[Document]:
     """
     Load documents from file or directory.
     
-    Delegates to sync version for now, but allows for future async file loading.
+    Files in a directory are read and parsed concurrently in worker threads,
+    at most MAX_CONCURRENT_FILE_READS at a time.
     """
-    return load_documents_sync(file_path)
+    if not file_path.is_dir():
+        return await asyncio.to_thread(load_documents_sync, file_path)
+    
+    click.echo(f"Processing directory: {file_path}")
+    paths = await asyncio.to_thread(_supported_files, file_path)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILE_READS)
+    
+    async def _load(path: Path) -> List[Document]:
+        async with semaphore:
+            return await asyncio.to_thread(_process_file, path)
+    
+    results = await asyncio.gather(*(_load(path) for path in paths))
+    return [document for documents in results for document in documents]
 
 
 def load_documents_sync(file_path: Path) -> List[Document]:
     """
     Load documents from file or directory.
     
-    Currently supports simple text processing.
-    Can be extended for specific file formats (JSON, CSV, etc).
+    Directories with at least PROCESS_POOL_MIN_FILES files are parsed in a
+    process pool, since JSON/CSV parsing holds the GIL.
     """
     documents = []
     
@@ -143,42 +204,49 @@ def load_documents_sync(file_path: Path) -> List[Document]:
         click.echo(f"Processing file: {file_path}")
         documents.extend(_process_file(file_path))
     elif file_path.is_dir():
-        # Process all files in directory
+        # Process all supported files in directory
         click.echo(f"Processing directory: {file_path}")
-        for root, _, files in os.walk(file_path):
-            for filename in files:
-                filepath = Path(root) / filename
-                click.echo(f"Processing file: {filepath}")
-                documents.extend(_process_file(filepath))
+        paths = _supported_files(file_path)
+        if len(paths) < PROCESS_POOL_MIN_FILES:
+            with click.progressbar(paths, label="Processing files") as bar:
+                for path in bar:
+                    documents.extend(_process_file(path))
+        else:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(paths))) as executor:
+                results = executor.map(_process_file, paths, chunksize=4)
+                with click.progressbar(results, length=len(paths), label="Processing files") as bar:
+                    for file_documents in bar:
+                        documents.extend(file_documents)
     
     return documents
 
 
+def _supported_files(directory: Path) -> List[Path]:
+    """List the files under a directory, recursively, that _process_file can handle."""
+    return [
+        path for path in directory.rglob("*")
+        if path.suffix.lower() in FILE_HANDLERS and path.is_file()
+    ]
+
+
 def _process_file(file_path: Path) -> List[Document]:
     """
     Process a single file based on its extension.
     
-    Can be extended to support different file formats.
+    Register new formats in FILE_HANDLERS.
     """
-    # Simple implementation - check file extension and handle accordingly
     suffix = file_path.suffix.lower()
-    
-    if suffix == '.txt':
-        return _process_text_file(file_path)
-    elif suffix == '.json':
-        return _process_json_file(file_path)
-    elif suffix == '.csv':
-        return _process_csv_file(file_path)
-    else:
+    handler = FILE_HANDLERS.get(suffix)
+    if handler is None:
         click.echo(f"Unsupported file format: {suffix}")
         return []
+    return handler(file_path)
 
 
 def _process_text_file(file_path: Path) -> List[Document]:
     """Process a text file into a Document."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_path.read_text(encoding='utf-8', errors='replace')
         
         # Create a document with the content and metadata
         return [Document(
@@ -195,51 +263,54 @@ def _process_text_file(file_path: Path) -> List[Document]:
 
 
 def _process_json_file(file_path: Path) -> List[Document]:
-    """Process a JSON file into Documents."""
-    import json
+    """
+    Process a JSON file into Documents.
     
+    Top-level arrays are streamed item by item when ijson is installed, so a
+    large dump is never held in memory as parsed JSON and Documents at once.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         documents = []
-        
-        # Handle different JSON formats
-        if isinstance(data, list):
-            # Assume list of items (like recipes, nutrition facts, etc.)
-            for i, item in enumerate(data):
-                if isinstance(item, dict):
-                    # Extract content and metadata fields
-                    content = _extract_content_from_dict(item)
-                    metadata = {k: v for k, v in item.items() if k != 'content'}
-                    
-                    # Add file source and chunk_id to metadata
-                    metadata.update({
-                        "source": str(file_path),
-                        "filename": file_path.name,
-                        "chunk_id": f"json_{file_path.stem}_{i}"
-                    })
-                    
-                    documents.append(Document(
-                        page_content=content,
-                        metadata=metadata
-                    ))
-        elif isinstance(data, dict):
-            # Single document
-            content = _extract_content_from_dict(data)
-            metadata = {k: v for k, v in data.items() if k != 'content'}
+        with open(file_path, 'rb') as f:
+            streamed = IJSON_AVAILABLE and _starts_with_array(f)
+            data = ijson.items(f, "item", use_float=True) if streamed else orjson.loads(f.read())
             
-            # Add file source and chunk_id to metadata
-            metadata.update({
-                "source": str(file_path),
-                "filename": file_path.name,
-                "chunk_id": f"json_{file_path.stem}"
-            })
+            source = str(file_path)
             
-            documents.append(Document(
-                page_content=content,
-                metadata=metadata
-            ))
+            # Handle different JSON formats
+            if streamed or isinstance(data, list):
+                # Assume list of items (like recipes, nutrition facts, etc.)
+                for i, item in enumerate(data):
+                    if isinstance(item, dict):
+                        # Extract content and metadata fields
+                        content = _extract_content_from_dict(item)
+                        metadata = item.copy()
+                        metadata.pop('content', None)
+                        
+                        # Add file source and chunk_id to metadata
+                        metadata["source"] = source
+                        metadata["filename"] = file_path.name
+                        metadata["chunk_id"] = f"json_{file_path.stem}_{i}"
+                        
+                        documents.append(Document(
+                            page_content=content,
+                            metadata=metadata
+                        ))
+            elif isinstance(data, dict):
+                # Single document
+                content = _extract_content_from_dict(data)
+                metadata = data.copy()
+                metadata.pop('content', None)
+                
+                # Add file source and chunk_id to metadata
+                metadata["source"] = source
+                metadata["filename"] = file_path.name
+                metadata["chunk_id"] = f"json_{file_path.stem}"
+                
+                documents.append(Document(
+                    page_content=content,
+                    metadata=metadata
+                ))
         
         return documents
     except Exception as e:
@@ -247,6 +318,18 @@ def _process_json_file(file_path: Path) -> List[Document]:
         return []
 
 
+def _starts_with_array(f: BinaryIO) -> bool:
+    """Check whether a JSON file's top-level value is an array, leaving the file at its start."""
+    first = f.read(64).lstrip()
+    while not first:
+        chunk = f.read(64)
+        if not chunk:
+            break
+        first = chunk.lstrip()
+    f.seek(0)
+    return first[:1] == b"["
+
+
 # TODO: This needs to be corrected, our main values currently live in quote and instructions fields. Unify the data or update this method accordingly.
 def _extract_content_from_dict(data: dict) -> str:
     """
@@ -261,46 +344,56 @@ def _extract_content_from_dict(data: dict) -> str:
         return str(data['content'])
     
     # Otherwise, try some common fields that might contain text
-    potential_content_fields = [
-        'description', 'text', 'body', 'summary', 'info',
-        'details', 'title', 'name', 'instructions'
-    ]
-    
-    content_parts = []
-    for field in potential_content_fields:
-        if field in data and data[field]:
-            if field in ['title', 'name']:
-                content_parts.insert(0, f"{data[field]}\n")
-            else:
-                content_parts.append(str(data[field]))
+    headers = [f"{data[field]}\n" for field in HEADER_FIELDS if data.get(field)]
+    bodies = [str(data[field]) for field in BODY_FIELDS if data.get(field)]
     
     # If we found content fields, join them
-    if content_parts:
-        return "\n\n".join(content_parts)
+    if headers or bodies:
+        return "\n\n".join(headers + bodies)
     
     # As a last resort, serialize the whole object
     return str(data)
 
 
 def _process_csv_file(file_path: Path) -> List[Document]:
-    """Process a CSV file into Documents."""
+    """
+    Process a CSV file into Documents.
+    
+    The header is read once to find the content columns, so each row is
+    handled positionally with the same rules as _extract_content_from_dict.
+    """
     import csv
     
     try:
         documents = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for i, row in enumerate(reader):
-                # Extract row data
-                content = _extract_content_from_dict(row)
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return []
+            
+            # Resolve the content columns once for the whole file
+            width = len(header)
+            content_index = header.index("content") if "content" in header else None
+            header_indexes = tuple(header.index(field) for field in HEADER_FIELDS if field in header)
+            body_indexes = tuple(header.index(field) for field in BODY_FIELDS if field in header)
+            file_metadata = {"source": str(file_path), "filename": file_path.name}
+            
+            # Blank lines are skipped, as csv.DictReader does
+            for i, row in enumerate(row for row in reader if row):
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+                metadata = dict(zip(header, row))
                 
-                # Create metadata
-                metadata = {k: v for k, v in row.items()}
-                metadata.update({
-                    "source": str(file_path),
-                    "filename": file_path.name,
-                    "chunk_id": f"csv_{file_path.stem}_{i}"
-                })
+                if content_index is not None:
+                    content = row[content_index]
+                else:
+                    parts = [f"{row[j]}\n" for j in header_indexes if row[j]]
+                    parts += [row[j] for j in body_indexes if row[j]]
+                    content = "\n\n".join(parts) if parts else str(metadata)
+                
+                metadata.update(file_metadata)
+                metadata["chunk_id"] = f"csv_{file_path.stem}_{i}"
                 
                 documents.append(Document(
                     page_content=content,
@@ -313,5 +406,13 @@ def _process_csv_file(file_path: Path) -> List[Document]:
         return []
 
 
+# Lowercase file extension -> loader used by _process_file
+FILE_HANDLERS: Dict[str, Callable[[Path], List[Document]]] = {
+    ".txt": _process_text_file,
+    ".json": _process_json_file,
+    ".csv": _process_csv_file,
+}
+
+
 if __name__ == "__main__":
     embed() 
\ No newline at end of file
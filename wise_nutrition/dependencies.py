@@ -1,18 +1,26 @@
 """
 FastAPI dependencies for creating shared resources.
 """
-import os
-from typing import Annotated # Use Annotated for Depends
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Dict, Iterator, List, TypeVar # Use Annotated for Depends
 
+import orjson
 from fastapi import Depends
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain_core.runnables import Runnable, RunnablePassthrough
 from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore, VectorStore
 from langchain_core.retrievers import BaseRetriever
 
 # Import application components
 from wise_nutrition.utils.config import Config
+from wise_nutrition.utils.http import get_http_client, get_async_http_client, close_http_clients
 from wise_nutrition.rag_chain import NutritionRAGChain
 from wise_nutrition.memory import ConversationMemoryManager
 from wise_nutrition.query_reformulation import QueryReformulator
@@ -20,195 +28,475 @@ from wise_nutrition.enhanced_retriever import EnhancedNutritionRetriever
 from wise_nutrition.retriever import NutritionRetriever
 from wise_nutrition.reranker import DocumentReRanker, ReRankingConfig
 from wise_nutrition.citation_generator import CitationGenerator
-from langgraph.checkpoint.memory import MemorySaver # Default saver
-# TODO: Add import for persistent saver like SqliteSaver when implemented
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# The FAISS sample backend needs the optional faiss package
+FAISS_AVAILABLE = find_spec("faiss") is not None
+
+if TYPE_CHECKING:
+    # langchain_openai and Chroma pull in large dependency trees, so they are
+    # imported where they are first used rather than at API startup
+    from langchain_community.vectorstores import FAISS, Chroma
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 # Create a Config instance for use in the dependencies
-config = Config()
+config = Config.instance()
+
+# Sample corpus indexed when no vector store has been persisted yet
+SAMPLES_DIR = Path("data/samples")
+
+# Metadata shared by every document from each sample file; copied per document
+_NUTRITION_METADATA = {"source": "nutrition_sample", "type": "general"}
+_VITAMIN_METADATA = {"source": "vitamins_sample", "type": "vitamin"}
+_RECIPE_METADATA = {"source": "recipes_sample", "type": "recipe"}
+
+# Document embeddings of the sample corpus, reused across vector store rebuilds
+EMBEDDING_CACHE_DIR = Path(".embedding_cache")
+
+# Dimension of the local, network-free embeddings used by the fallback retriever
+FALLBACK_EMBEDDING_SIZE = 64
+
+# Serializes the first build of the cached retrievers, so concurrent requests
+# on a cold worker don't each open the vector store. Reentrant because
+# get_retriever() builds on get_base_retriever().
+_build_lock = threading.RLock()
+
+# Set while the vector store is being built in the background; until it is
+# cleared, requests are served from the fallback retriever
+_vector_store_building = threading.Event()
 
 # --- Dependency Functions --- #
 
 # Singleton pattern for Memory Manager (optional, but often useful)
-# Initialize it once here, or use FastAPI's state or lifespan events
-# For simplicity, initialize here for now.
-# TODO: Consider using SqliteSaver for persistence
-_memory_manager_instance = ConversationMemoryManager(memory_saver=MemorySaver())
+# Conversations are persisted through the manager's default
+# FileSystemCheckpointSaver, so they survive restarts. Each worker caches
+# the sessions it has served and doesn't re-read their files, so a session
+# must stay on one worker to see all of its turns.
+_memory_manager_instance = ConversationMemoryManager(
+    checkpoint_dir=config.get("conversation_checkpoint_dir")
+)
 
 def get_memory_manager() -> ConversationMemoryManager:
     """Dependency to get the singleton ConversationMemoryManager instance."""
     return _memory_manager_instance
 
-def get_llm() -> Runnable:
-    """Dependency to get the language model instance."""
+@lru_cache(maxsize=1)
+def _chat_model() -> "ChatOpenAI":
+    """
+    Build the shared chat model once per process.
+    
+    Failures are not cached, so a later call retries the construction.
+    """
+    from langchain_openai import ChatOpenAI
+
     # TODO: Add error handling for API key
     api_key = config.openai_api_key
     if not api_key:
-        print("Warning: OPENAI_API_KEY not found in config/environment.")
+        logger.warning("OPENAI_API_KEY not found in config/environment.")
         # Optionally raise an HTTPException here if API key is strictly required
         # from fastapi import HTTPException
         # raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+    # Set up LLM with configuration
+    return ChatOpenAI(
+        model=config.openai_model_default,
+        api_key=api_key,
+        temperature=0,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        # Add LangSmith tracking metadata
+        tags=["nutrition_advisor", "openai"],
+        metadata={
+            "model": config.openai_model_default,
+            "use_case": "nutrition_advisory",
+            "service": "wise_nutrition"
+        }
+    )
+
+def get_llm() -> Runnable:
+    """Dependency to get the shared language model instance."""
     try:
-        # Set up LLM with configuration
-        return ChatOpenAI(
-            model=config.openai_model_default,
-            api_key=api_key,
-            temperature=0,
-            # Add LangSmith tracking metadata
-            tags=["nutrition_advisor", "openai"],
-            metadata={
-                "model": config.openai_model_default,
-                "use_case": "nutrition_advisory",
-                "service": "wise_nutrition"
-            }
-        )
-    except Exception as e:
-        print(f"Error initializing ChatOpenAI: {e}")
+        return _chat_model()
+    except Exception:
+        logger.exception("Error initializing ChatOpenAI")
         # Raise or return a fallback? For now, print error.
         # raise HTTPException(status_code=500, detail=f"Could not initialize LLM: {e}")
         # Returning Passthrough as a fallback might hide issues.
         return RunnablePassthrough() # Consider implications of fallback
 
+def reset_dependencies() -> None:
+    """Forget the cached models and retrievers so the next request rebuilds them."""
+    _chat_model.cache_clear()
+    _embeddings.cache_clear()
+    _vector_store.cache_clear()
+    _fallback_retriever.cache_clear()
+    _base_retriever.cache_clear()
+    _nutrition_retriever.cache_clear()
+    _reranking_retriever.cache_clear()
+    _enhanced_retriever.cache_clear()
+    _enhanced_reranking_retriever.cache_clear()
+    _retriever.cache_clear()
+    get_citation_generator.cache_clear()
+    get_query_reformulator.cache_clear()
+
+async def close_shared_clients() -> None:
+    """Close the shared HTTP pools and drop the models bound to them."""
+    await close_http_clients()
+    reset_dependencies()
+
+@lru_cache(maxsize=1)
+def _embeddings() -> "OpenAIEmbeddings":
+    """Build the shared embedding model once per process."""
+    from langchain_openai import OpenAIEmbeddings
+
+    api_key = config.openai_api_key
+    if not api_key:
+        logger.warning("OPENAI_API_KEY not found for retriever embeddings.")
+        # Consider raising exception if embeddings are critical
+    return OpenAIEmbeddings(
+        api_key=api_key,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
+
 def get_base_retriever() -> BaseRetriever:
     """
     Get the base vector store retriever without any enhancements.
     
-    This is used as a dependency for building enhanced retrievers.
+    This is used as a dependency for building enhanced retrievers. The
+    retriever is built on first use and shared by later requests. While the
+    vector store is still being built, or if building it failed, a small
+    fallback retriever is returned instead.
     """
-    api_key = config.openai_api_key
-    if not api_key:
-        print("Warning: OPENAI_API_KEY not found for retriever embeddings.")
-        # Consider raising exception if embeddings are critical
+    return _resolve_retriever(_base_for)
+
+def _resolve_retriever(build: Callable[[bool], T]) -> T:
+    """
+    Get a retriever built over the vector store, or over the fallback.
+    
+    Args:
+        build: Cached factory taking use_fallback, True to build over the
+            fallback retriever instead of the vector store
+    
+    Returns:
+        The retriever over the vector store once it is available, and the
+        fallback variant while it is being built or if building it failed
+    
+    Builders that need an LLM take it from ``_chat_model()`` rather than
+    ``get_llm()``, so a chat model that can't be created fails the request
+    instead of being cached inside a retriever as a passthrough.
+    """
+    if not _vector_store_building.is_set():
+        try:
+            with _build_lock:
+                return build(False)
+        except Exception:
+            logger.exception("Error creating retriever, using the fallback")
+    return build(True)
+
+def _base_for(use_fallback: bool) -> BaseRetriever:
+    """Get the cached base retriever, or the fallback one."""
+    return _fallback_retriever() if use_fallback else _base_retriever()
 
+@lru_cache(maxsize=1)
+def _base_retriever() -> BaseRetriever:
+    """Wrap the shared vector store in a retriever."""
+    return _vector_store().as_retriever(search_type="mmr", search_kwargs={"k": 5})
+
+@lru_cache(maxsize=1)
+def _vector_store() -> VectorStore:
+    """
+    Open the persisted vector store, building it from the samples on first run.
+    
+    The store is opened once per process; retrievers are cheap wrappers over it.
+    """
+    embeddings = _embeddings()
+    if config.vector_backend == "faiss":
+        if FAISS_AVAILABLE:
+            return _faiss_store(embeddings)
+        logger.warning("VECTOR_BACKEND=faiss but faiss is not installed, using Chroma.")
+    return _chroma_store(embeddings)
+
+def _document_cached(embeddings: "OpenAIEmbeddings") -> Embeddings:
+    """
+    Cache document embeddings on disk, keyed by a hash of the text and model.
+    
+    Rebuilding a deleted or corrupted store then re-embeds only the texts
+    that changed. Only index builds use the cache; the opened stores keep
+    the plain model, so query embeddings never reach the disk cache.
+    """
     try:
-        persist_directory = "chroma_db"
-        embedding_function = OpenAIEmbeddings(api_key=api_key)
-        
-        # Check if the vector store exists
-        if not os.path.exists(persist_directory):
-            # Create the directory and import data
-            os.makedirs(persist_directory)
-            
-            # Load sample data from files
-            documents = []
-            
-            # Load nutrition.txt
-            nutrition_path = "data/samples/nutrition.txt"
-            if os.path.exists(nutrition_path):
-                with open(nutrition_path, 'r') as f:
-                    content = f.read()
-                    # Split by double newlines to get sections
-                    sections = content.split('\n\n')
-                    for section in sections:
-                        if section.strip():
-                            documents.append(Document(
-                                page_content=section.strip(),
-                                metadata={"source": "nutrition_sample", "type": "general"}
-                            ))
-            
-            # Load vitamins.json
-            vitamins_path = "data/samples/vitamins.json"
-            if os.path.exists(vitamins_path):
-                import json
-                with open(vitamins_path, 'r') as f:
-                    vitamins_data = json.load(f)
-                    for vitamin in vitamins_data:
-                        content = f"Vitamin: {vitamin.get('name', '')}\n"
-                        content += f"Description: {vitamin.get('description', '')}\n"
-                        content += f"Benefits: {', '.join(vitamin.get('benefits', []))}\n"
-                        
-                        # Fix: Use food_sources instead of sources
-                        food_sources = vitamin.get('food_sources', [])
-                        content += f"Food Sources: {', '.join(food_sources)}\n"
-                        
-                        # Add RDA information
-                        rda = vitamin.get('rda', {})
-                        if rda:
-                            content += "Recommended Daily Allowance:\n"
-                            for group, amount in rda.items():
-                                content += f"  - {group}: {amount}\n"
-                        
-                        # Add deficiency symptoms
-                        deficiency = vitamin.get('deficiency_symptoms', [])
-                        if deficiency:
-                            content += f"Deficiency Symptoms: {', '.join(deficiency)}"
-                        
-                        documents.append(Document(
-                            page_content=content,
-                            metadata={"source": "vitamins_sample", "type": "vitamin", "name": vitamin.get('name', '')}
-                        ))
-            
-            # Load recipes.json
-            recipes_path = "data/samples/recipes.json"
-            if os.path.exists(recipes_path):
-                import json
-                with open(recipes_path, 'r') as f:
-                    recipes_data = json.load(f)
-                    for recipe in recipes_data:
-                        content = f"Recipe: {recipe.get('name', '')}\n"
-                        content += f"Description: {recipe.get('description', '')}\n"
-                        content += f"Ingredients: {', '.join(recipe.get('ingredients', []))}\n"
-                        content += f"Instructions: {recipe.get('instructions', '')}\n"
-                        content += f"Nutrition: {recipe.get('nutrition_info', '')}"
-                        
-                        documents.append(Document(
-                            page_content=content,
-                            metadata={"source": "recipes_sample", "type": "recipe", "name": recipe.get('name', '')}
-                        ))
-            
-            print(f"Loaded {len(documents)} documents from sample files")
-            
-            # Create and persist the vector store
-            vector_store = Chroma.from_documents(
-                documents, embedding_function,
-                persist_directory=persist_directory
-            )
-            vector_store.persist()
-            print(f"Vector store created and persisted at {persist_directory}")
-        else:
-            # Load existing vector store
-            vector_store = Chroma(
-                persist_directory=persist_directory,
-                embedding_function=embedding_function
-            )
-            print(f"Loaded existing vector store from {persist_directory}")
-            
-        # Return the retriever
-        return vector_store.as_retriever(search_type="mmr", search_kwargs={"k": 5})
+        from langchain.embeddings import CacheBackedEmbeddings
+        from langchain.storage import LocalFileStore
+    except ImportError:
+        return embeddings
+    return CacheBackedEmbeddings.from_bytes_store(
+        embeddings,
+        LocalFileStore(EMBEDDING_CACHE_DIR),
+        namespace=embeddings.model,
+    )
+
+def _chroma_store(embeddings: Embeddings) -> "Chroma":
+    """Open the sample Chroma store, indexing the samples if it doesn't exist yet."""
+    from langchain_community.vectorstores import Chroma
+
+    persist_directory = Path("chroma_db")
+
+    # An empty directory means an earlier build never got to write anything
+    persist_directory.mkdir(parents=True, exist_ok=True)
+    if not any(persist_directory.iterdir()):
+        started = time.perf_counter()
+        documents = _load_sample_documents()
+
+        # Create the vector store. Chroma embeds each insert batch with a
+        # single embed_documents call and persists writes automatically
+        Chroma.from_documents(
+            documents, _document_cached(embeddings),
+            persist_directory=str(persist_directory)
+        )
+        logger.info(
+            "Built vector store from %d sample documents at %s in %.2fs",
+            len(documents), persist_directory, time.perf_counter() - started,
+        )
+    else:
+        logger.info("Loading existing vector store from %s", persist_directory)
+
+    return Chroma(
+        persist_directory=str(persist_directory),
+        embedding_function=embeddings
+    )
+
+def _faiss_store(embeddings: Embeddings) -> "FAISS":
+    """
+    Load the sample FAISS index, building and saving it if it doesn't exist yet.
+    
+    The sample corpus is small enough for exact search, so the index is a flat
+    inner-product index. OpenAI embeddings are unit length, which makes the
+    inner product their cosine similarity.
+    """
+    from langchain_community.vectorstores import FAISS
+    from langchain_community.vectorstores.utils import DistanceStrategy
+
+    persist_directory = Path("faiss_index")
+    if (persist_directory / "index.faiss").exists():
+        # The index was written by this process or an earlier one; it is not
+        # user supplied, so unpickling its docstore is safe
+        vector_store = FAISS.load_local(
+            str(persist_directory), embeddings,
+            allow_dangerous_deserialization=True,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        )
+        logger.info("Loaded existing vector store from %s", persist_directory)
+        return vector_store
+
+    started = time.perf_counter()
+    documents = _load_sample_documents()
+    texts = [document.page_content for document in documents]
+    vectors = _document_cached(embeddings).embed_documents(texts)
+    vector_store = FAISS.from_embeddings(
+        zip(texts, vectors), embeddings,
+        metadatas=[document.metadata for document in documents],
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+    vector_store.save_local(str(persist_directory))
+    logger.info(
+        "Built vector store from %d sample documents at %s in %.2fs",
+        len(documents), persist_directory, time.perf_counter() - started,
+    )
+    return vector_store
+
+def _load_sample_documents() -> List[Document]:
+    """Read the sample corpus under SAMPLES_DIR into Documents."""
+    # Load sample data from files
+    documents = []
+
+    # Load nutrition.txt, one section per blank-line separated block
+    for section in _iter_text_sections(SAMPLES_DIR / "nutrition.txt"):
+        documents.append(Document(
+            page_content=section,
+            metadata=dict(_NUTRITION_METADATA)
+        ))
+
+    # Load vitamins.json and recipes.json
+    documents.extend(map(_vitamin_to_document, _iter_json_items(SAMPLES_DIR / "vitamins.json")))
+    documents.extend(map(_recipe_to_document, _iter_json_items(SAMPLES_DIR / "recipes.json")))
+
+    return documents
+
+def _vitamin_to_document(vitamin: Dict[str, Any]) -> Document:
+    """Render a vitamins.json entry as a Document."""
+    name = vitamin.get('name', '')
+    lines = [
+        f"Vitamin: {name}",
+        f"Description: {vitamin.get('description', '')}",
+        f"Benefits: {', '.join(vitamin.get('benefits', []))}",
+        f"Food Sources: {', '.join(vitamin.get('food_sources', []))}",
+    ]
+    
+    # Add RDA information
+    rda = vitamin.get('rda', {})
+    if rda:
+        lines.append("Recommended Daily Allowance:")
+        lines.extend(f"  - {group}: {amount}" for group, amount in rda.items())
+    
+    # Add deficiency symptoms
+    deficiency = vitamin.get('deficiency_symptoms', [])
+    if deficiency:
+        lines.append(f"Deficiency Symptoms: {', '.join(deficiency)}")
+    
+    return Document(
+        page_content="\n".join(lines),
+        metadata={**_VITAMIN_METADATA, "name": name}
+    )
+
+def _recipe_to_document(recipe: Dict[str, Any]) -> Document:
+    """Render a recipes.json entry as a Document."""
+    name = recipe.get('name', '')
+    return Document(
+        page_content=(
+            f"Recipe: {name}\n"
+            f"Description: {recipe.get('description', '')}\n"
+            f"Ingredients: {', '.join(recipe.get('ingredients', []))}\n"
+            f"Instructions: {recipe.get('instructions', '')}\n"
+            f"Nutrition: {recipe.get('nutrition_info', '')}"
+        ),
+        metadata={**_RECIPE_METADATA, "name": name}
+    )
+
+@lru_cache(maxsize=1)
+def _fallback_retriever() -> BaseRetriever:
+    """
+    Build a retriever over a small fixed set of documents.
+    
+    The fallback has to work when OpenAI or Chroma is what failed, so it
+    keeps its vectors in memory and embeds them locally. The retriever
+    returns k=4 documents, which is every fallback document, so the fake
+    embeddings don't affect what it returns.
+    """
+    fallback_docs = [
+        Document(page_content="Vitamin D is essential for calcium absorption and bone health."),
+        Document(page_content="Good sources of Vitamin D include sunlight, fatty fish, fortified foods."),
+        Document(page_content="Vitamin C supports immune function and is found in citrus fruits."),
+        Document(page_content="Iron is important for blood health and can be found in red meat and leafy greens.")
+    ]
+    fallback_db = InMemoryVectorStore.from_documents(
+        fallback_docs, DeterministicFakeEmbedding(size=FALLBACK_EMBEDDING_SIZE)
+    )
+    logger.info("Created fallback retriever with basic nutrition information")
+    return fallback_db.as_retriever()
+
+def warm_up_retriever() -> None:
+    """
+    Open the vector store and run one query against it.
+    
+    This loads the store's index before the first user query needs it.
+    """
+    try:
+        with _build_lock:
+            _base_retriever().vectorstore.similarity_search("nutrition", k=1)
     except Exception as e:
-        print(f"Error creating retriever: {e}")
-        # Create a small fallback set of documents if vector store creation fails
-        fallback_docs = [
-            Document(page_content="Vitamin D is essential for calcium absorption and bone health."),
-            Document(page_content="Good sources of Vitamin D include sunlight, fatty fish, fortified foods."),
-            Document(page_content="Vitamin C supports immune function and is found in citrus fruits."),
-            Document(page_content="Iron is important for blood health and can be found in red meat and leafy greens.")
-        ]
-        fallback_db = Chroma.from_documents(fallback_docs, embedding_function)
-        print("Created fallback retriever with basic nutrition information")
-        return fallback_db.as_retriever()
-
-def get_nutrition_retriever(
-    base_retriever: Annotated[BaseRetriever, Depends(get_base_retriever)]
-) -> NutritionRetriever:
+        # Failures aren't cached, so requests retry the build
+        logger.warning("Vector store warm-up failed: %s", e)
+
+def _build_vector_store() -> None:
+    """Warm the vector store, then switch requests over from the fallback."""
+    try:
+        warm_up_retriever()
+    finally:
+        _vector_store_building.clear()
+
+def start_vector_store_build() -> Future:
+    """
+    Build and warm the vector store on a background thread.
+    
+    Requests are answered by the fallback retriever until the build finishes,
+    so startup and early requests aren't blocked on embedding the samples.
+    
+    Returns:
+        A future that completes when the build has finished or failed
+    """
+    _vector_store_building.set()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-store-build")
+    future = executor.submit(_build_vector_store)
+    # Let the worker thread exit once the build is done
+    executor.shutdown(wait=False)
+    return future
+
+def _iter_text_sections(path: Path) -> Iterator[str]:
+    """
+    Yield the blank-line separated sections of a text file.
+    
+    The file is read line by line, so only one section is held in memory.
+    Missing files yield nothing.
+    """
+    try:
+        f = path.open("r")
+    except FileNotFoundError:
+        return
+    with f:
+        buffer: List[str] = []
+        for line in f:
+            if line.strip():
+                buffer.append(line)
+            elif buffer:
+                yield "".join(buffer).strip()
+                buffer.clear()
+        if buffer:
+            yield "".join(buffer).strip()
+
+def _iter_json_items(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the items of a file holding a top-level JSON array.
+    
+    Items are streamed one at a time when ijson is installed. Missing files
+    yield nothing.
+    """
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return
+    with f:
+        if IJSON_AVAILABLE:
+            yield from ijson.items(f, "item", use_float=True)
+        else:
+            yield from orjson.loads(f.read())
+
+def get_nutrition_retriever() -> NutritionRetriever:
     """
     Dependency to get the standard NutritionRetriever instance.
     
     This is the standard retriever without query reformulation.
     """
+    return _resolve_retriever(_nutrition_retriever)
+
+@lru_cache(maxsize=2)
+def _nutrition_retriever(use_fallback: bool) -> NutritionRetriever:
+    """Build the shared standard retriever."""
     return NutritionRetriever(
-        base_retriever=base_retriever,
+        base_retriever=_base_for(use_fallback),
         k=4
     )
 
-def get_reranking_retriever(
-    base_retriever: Annotated[BaseRetriever, Depends(get_base_retriever)]
-) -> NutritionRetriever:
+def get_reranking_retriever() -> NutritionRetriever:
     """
     Dependency to get a retriever with post-retrieval reranking capabilities.
     
     This retriever includes a document reranker to improve the quality
     of results using multiple relevance metrics.
     """
+    return _resolve_retriever(_reranking_retriever)
+
+@lru_cache(maxsize=2)
+def _reranking_retriever(use_fallback: bool) -> NutritionRetriever:
+    """Build the shared reranking retriever."""
     # Create reranking config with custom weights if needed
     reranking_config = ReRankingConfig(
         semantic_weight=0.6,
@@ -221,52 +509,62 @@ def get_reranking_retriever(
     
     # Create retriever with reranking enabled
     return NutritionRetriever.with_reranker(
-        base_retriever=base_retriever,
+        base_retriever=_base_for(use_fallback),
         k=4,
         reranking_config=reranking_config
     )
 
-def get_query_reformulator(
-    llm: Annotated[Runnable, Depends(get_llm)]
-) -> QueryReformulator:
-    """Dependency to get the query reformulator for query enhancement."""
+@lru_cache(maxsize=1)
+def get_query_reformulator() -> QueryReformulator:
+    """
+    Dependency to get the shared query reformulator for query enhancement.
+    
+    Sharing one instance lets its memo of alternative queries serve every
+    request. It uses the chat model directly, so if the model can't be
+    created the request fails and nothing is cached.
+    """
     return QueryReformulator(
-        llm=llm,
+        llm=_chat_model(),
         include_original=True
     )
 
-def get_enhanced_retriever(
-    base_retriever: Annotated[BaseRetriever, Depends(get_base_retriever)],
-    llm: Annotated[Runnable, Depends(get_llm)]
-) -> EnhancedNutritionRetriever:
+def get_enhanced_retriever() -> EnhancedNutritionRetriever:
     """
     Dependency to get the enhanced retriever with query reformulation.
     
     This retriever uses LLM-powered query reformulation to generate multiple
     perspectives on the original query for improved retrieval accuracy.
     """
+    return _resolve_retriever(_enhanced_retriever)
+
+@lru_cache(maxsize=2)
+def _enhanced_retriever(use_fallback: bool) -> EnhancedNutritionRetriever:
+    """Build the shared query-reformulating retriever."""
     return EnhancedNutritionRetriever.from_llm(
-        base_retriever=base_retriever,
-        llm=llm,
+        base_retriever=_base_for(use_fallback),
+        llm=_chat_model(),
         k=4,
         max_queries=4,
         include_original=True
     )
 
+@lru_cache(maxsize=1)
 def get_citation_generator() -> CitationGenerator:
     """Dependency to get the citation generator instance."""
     return CitationGenerator(default_style="mla")
 
-def get_enhanced_reranking_retriever(
-    base_retriever: Annotated[BaseRetriever, Depends(get_base_retriever)],
-    llm: Annotated[Runnable, Depends(get_llm)]
-) -> Runnable:
+def get_enhanced_reranking_retriever() -> Runnable:
     """
     Dependency to get an enhanced retriever with both query reformulation and reranking.
     
     This retriever combines the improved retrieval capabilities of query reformulation
     with post-retrieval reranking for optimal results.
     """
+    return _resolve_retriever(_enhanced_reranking_retriever)
+
+@lru_cache(maxsize=2)
+def _enhanced_reranking_retriever(use_fallback: bool) -> Runnable:
+    """Build the shared query-reformulating, reranking retriever."""
     # Create reranking config
     reranking_config = ReRankingConfig(
         top_n_to_rerank=20  # Rerank more results since we'll have more from multiple queries
@@ -277,8 +575,8 @@ def get_enhanced_reranking_retriever(
     
     # Create enhanced retriever with reranking capabilities
     retriever = EnhancedNutritionRetriever.from_llm(
-        base_retriever=base_retriever,
-        llm=llm,
+        base_retriever=_base_for(use_fallback),
+        llm=_chat_model(),
         k=8,  # Get more initial results to enable better reranking
         max_queries=4,
         include_original=True
@@ -297,10 +595,15 @@ def get_retriever() -> Runnable:
     By default, this returns the enhanced retriever with query reformulation.
     Change this function to return a different retriever implementation if needed.
     """
+    return _resolve_retriever(_retriever)
+
+@lru_cache(maxsize=2)
+def _retriever(use_fallback: bool) -> Runnable:
+    """Build the enhanced reranking retriever shared by all requests."""
     # We're using dependency injection to get a fully configured enhanced retriever
     # Use Depends directly in this function to avoid circular dependencies
-    llm = get_llm()
-    base_retriever = get_base_retriever()
+    llm = _chat_model()
+    base_retriever = _base_for(use_fallback)
     
     # Return the enhanced retriever with reranking for maximum quality
     enhanced_retriever = EnhancedNutritionRetriever.from_llm(
@@ -11,6 +11,10 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
 from langchain_chroma import Chroma
 from wise_nutrition.utils.config import Config
+from wise_nutrition.utils.http import get_http_client, get_async_http_client
+
+# Documents embedded and written to Chroma per add_documents call
+ADD_BATCH_SIZE = 1024
 
 
 class ChromaEmbeddingManager:
@@ -34,13 +38,15 @@ class ChromaEmbeddingManager:
             persist_directory: Directory to persist ChromaDB data
             vector_store: Existing Chroma vector store instance
         """
-        self._config = config or Config()
+        self._config = config or Config.instance()
         self._collection_name = collection_name or "nutrition_collection"
         self._persist_directory = persist_directory or os.path.join(os.getcwd(), "chroma_db")
         
         # Initialize OpenAI embeddings
         self._embeddings = OpenAIEmbeddings(
-            openai_api_key=self._config.openai_api_key
+            openai_api_key=self._config.openai_api_key,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
         )
         
         # Initialize Chroma vector store instance
@@ -140,7 +146,7 @@ class ChromaEmbeddingManager:
             doc.metadata = self._sanitize_metadata(doc.metadata)
         
         # Add documents to ChromaDB
-        self._vector_store.add_documents(docs_to_add)
+        self._add_in_batches(docs_to_add)
         # No need to call persist() as Chroma 0.4.x+ automatically persists
         print(f"Added {len(documents)} documents to ChromaDB collection '{self._collection_name}'")
     
@@ -167,10 +173,23 @@ class ChromaEmbeddingManager:
             doc.metadata = self._sanitize_metadata(doc.metadata)
         
         # Add documents to ChromaDB
-        self._vector_store.add_documents(docs_to_add)
+        self._add_in_batches(docs_to_add)
         # No need to call persist() as Chroma 0.4.x+ automatically persists
         print(f"Added {len(documents)} documents to ChromaDB collection '{self._collection_name}'")
     
+    def _add_in_batches(self, documents: List[Document]) -> None:
+        """
+        Add documents to the vector store ADD_BATCH_SIZE at a time.
+        
+        Each batch is embedded and upserted in one call, which keeps request
+        sizes within Chroma's maximum batch size for large ingests.
+        
+        Args:
+            documents: Sanitized documents to add
+        """
+        for start in range(0, len(documents), ADD_BATCH_SIZE):
+            self._vector_store.add_documents(documents[start:start + ADD_BATCH_SIZE])
+    
     async def _initialize_vector_store(self) -> Chroma:
         """
         Initialize the vector store asynchronously.
@@ -5,10 +5,9 @@ import asyncio
 import os
 import shutil
 from typing import List
-from dotenv import load_dotenv
 
 from langchain_core.documents import Document
-from wise_nutrition.utils.config import Config
+from wise_nutrition.utils.config import Config, ensure_env_loaded
 from wise_nutrition.embeddings.chroma_embedding_manager import ChromaEmbeddingManager
 from wise_nutrition.embeddings.embedding_factory import get_embedding_manager
 
@@ -17,7 +16,7 @@ def setup_env_for_local_development():
     """Set up environment variables for local development if not already present."""
     if not os.getenv("OPENAI_API_KEY"):
         # Load from .env file
-        load_dotenv()
+        ensure_env_loaded()
         
         # If still not set, use placeholder for demo
         if not os.getenv("OPENAI_API_KEY"):
@@ -72,7 +71,7 @@ async def run_async_example():
     
     # Create ChromaDB embedding manager
     manager = ChromaEmbeddingManager(
-        config=Config(),
+        config=Config.instance(),
         collection_name="nutrition_collection_async",
         persist_directory=persist_directory
     )
@@ -111,7 +110,7 @@ def run_sync_example():
     
     # Create ChromaDB embedding manager
     manager = ChromaEmbeddingManager(
-        config=Config(),
+        config=Config.instance(),
         collection_name="nutrition_collection_sync",
         persist_directory=persist_directory
     )
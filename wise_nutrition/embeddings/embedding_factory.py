@@ -24,7 +24,7 @@ def get_embedding_manager(
     Returns:
         An embedding manager instance
     """
-    config = config or Config()
+    config = config or Config.instance()
     db_type = vector_db_type or config.vector_db_type
     
     if db_type.lower() == 'chroma':
@@ -57,7 +57,7 @@ async def get_document_retriever(
     Returns:
         A document retriever
     """
-    config = config or Config()
+    config = config or Config.instance()
     db_type = vector_db_type or config.vector_db_type
     
     manager = get_embedding_manager(config, db_type, async_mode=True)
@@ -84,7 +84,7 @@ def get_document_retriever_sync(
     Returns:
         A document retriever
     """
-    config = config or Config()
+    config = config or Config.instance()
     db_type = vector_db_type or config.vector_db_type
     
     manager = get_embedding_manager(config, db_type, async_mode=False)
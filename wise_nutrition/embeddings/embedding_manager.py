@@ -1,6 +1,8 @@
 """
 Embedding manager module.
 """
+import atexit
+from functools import cache
 from typing import List, Optional, Any, Dict
 
 import weaviate
@@ -9,6 +11,7 @@ from langchain_core.documents import Document
 from langchain_community.vectorstores import Weaviate
 from langchain_unstructured import UnstructuredLoader
 from wise_nutrition.utils.config import Config
+from wise_nutrition.utils.http import get_http_client, get_async_http_client
 
 # Example of a document chunk for recipe 
 # {
@@ -29,6 +32,52 @@ from wise_nutrition.utils.config import Config
 #   "chunk_id": "theory_fermentation_lactic"
 # } 
 
+# Clients handed out by get_weaviate_client, kept so they can be closed
+_open_clients: List[weaviate.Client] = []
+
+
+@cache
+def get_weaviate_client(url: str, api_key: str) -> weaviate.Client:
+    """
+    Get a Weaviate client for the given instance, reusing one per process.
+    
+    Args:
+        url: Weaviate instance URL
+        api_key: Weaviate API key
+        
+    Returns:
+        A shared Weaviate client
+    """
+    client = weaviate.Client(
+        url=url,
+        auth_client_secret=weaviate.AuthApiKey(api_key=api_key),
+    )
+    _open_clients.append(client)
+    return client
+
+
+def close_weaviate_clients() -> None:
+    """
+    Close the shared Weaviate clients and forget them.
+    
+    Runs automatically at interpreter exit; tests call it to drop clients
+    created under mocks.
+    """
+    while _open_clients:
+        client = _open_clients.pop()
+        # Older weaviate clients have no close(); they hold no pooled connections
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                print(f"Error closing Weaviate client: {e}")
+    get_weaviate_client.cache_clear()
+
+
+atexit.register(close_weaviate_clients)
+
+
 class EmbeddingManager:
     """
     Manage document embeddings and storage in Weaviate.
@@ -47,18 +96,20 @@ class EmbeddingManager:
             config: Configuration object containing API keys and URLs
             collection_name: Name of the collection in Weaviate
         """
-        self._config = config or Config()
+        self._config = config or Config.instance()
         self._collection_name = collection_name or self._config.weaviate_collection_name
         
-        # Initialize Weaviate client
-        self._client = weaviate.Client(
-            url=self._config.weaviate_url,
-            auth_client_secret=weaviate.AuthApiKey(api_key=self._config.weaviate_api_key),
+        # Reuse the process-wide Weaviate client for this instance
+        self._client = get_weaviate_client(
+            self._config.weaviate_url,
+            self._config.weaviate_api_key
         )
         
         # Initialize OpenAI embeddings
         self._embeddings = OpenAIEmbeddings(
-            openai_api_key=self._config.openai_api_key
+            openai_api_key=self._config.openai_api_key,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
         )
         
         # Initialize Weaviate vector store instance
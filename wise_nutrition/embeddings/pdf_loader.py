@@ -15,6 +15,7 @@ from langchain_unstructured import UnstructuredLoader
 from langchain_core.output_parsers import JsonOutputParser
 from langchain.output_parsers.openai_functions import JsonOutputFunctionsParser
 from wise_nutrition.utils.config import Config
+from wise_nutrition.utils.http import get_http_client, get_async_http_client
 
 
 class NutritionPDFLoader:
@@ -43,7 +44,7 @@ class NutritionPDFLoader:
             chunk_size: The size of text chunks to create
             chunk_overlap: The overlap between consecutive chunks
         """
-        self._config = config or Config()
+        self._config = config or Config.instance()
         self._recipe_start_marker = recipe_start_marker
         self._recipe_end_marker = recipe_end_marker
         self._chunk_size = chunk_size
@@ -59,7 +60,9 @@ class NutritionPDFLoader:
         self._llm = ChatOpenAI(
             api_key=self._config.openai_api_key,
             model=self._config.openai_model_default,
-            temperature=0
+            temperature=0,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
         )
     
     def _extract_recipe_text(self, pdf_path: str) -> str:
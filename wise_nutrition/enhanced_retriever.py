@@ -4,14 +4,20 @@ Enhanced Retriever with Query Reformulation capabilities.
 This module extends the NutritionRetriever to include query reformulation,
 which generates multiple alternative queries to improve retrieval accuracy.
 """
+import asyncio
 from typing import List, Dict, Any, Optional, Union
 
-from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.language_models import BaseLLM
 from langchain_core.runnables import Runnable
 from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables.config import run_in_executor
+from langchain_core.vectorstores import VectorStoreRetriever
 
 from wise_nutrition.retriever import NutritionRetriever
 from wise_nutrition.query_reformulation import QueryReformulator
@@ -57,19 +63,99 @@ class EnhancedNutritionRetriever(NutritionRetriever):
             # Fall back to original query if reformulation fails
             alternative_queries = [query]
         
-        # Retrieve documents for each alternative query
+        # Retrieve documents for each alternative query, with one embedding
+        # call for all of them when the base retriever is a vector store
+        docs_per_query = self._batched_vector_search(alternative_queries)
+        if docs_per_query is None:
+            docs_per_query = [
+                self._retrieve(alt_query, run_manager.get_child())
+                for alt_query in alternative_queries
+            ]
+        
+        all_docs = [doc for docs in docs_per_query for doc in docs]
+        return self._finalize_documents(all_docs, query)
+    
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """
+        Asynchronously retrieve documents relevant to the query using query reformulation.
+        
+        When the original query is kept among the alternatives, it is
+        retrieved concurrently with reformulation; the remaining alternative
+        queries are then retrieved concurrently as well.
+        
+        Args:
+            query: Original user query string.
+            run_manager: Async callback manager for the retriever run.
+            
+        Returns:
+            List of relevant documents.
+        """
+        if not self.use_reformulation or self.query_reformulator is None:
+            # Fall back to base retriever functionality if reformulation is disabled
+            return await run_in_executor(
+                None,
+                super()._get_relevant_documents,
+                query,
+                run_manager=run_manager.get_sync()
+            )
+        
+        callbacks = run_manager.get_child()
+        
+        if self._can_batch_vector_search():
+            # Embedding every alternative in one call needs them all up front,
+            # so there is nothing to overlap with reformulation
+            alternative_queries = await self._areformulate(query)
+            docs_per_query = await self._abatched_vector_search(alternative_queries)
+            if docs_per_query is None:
+                docs_per_query = await asyncio.gather(
+                    *(self._aretrieve(alt_query, callbacks) for alt_query in alternative_queries)
+                )
+            all_docs = [doc for docs in docs_per_query for doc in docs]
+            return self._finalize_documents(all_docs, query)
+        
+        # The reformulator puts the original query first, so it survives the
+        # max_queries cut; only then is fetching it early not wasted work
+        prefetch_original = self.query_reformulator.include_original and self.max_queries > 0
+        if prefetch_original:
+            alternative_queries, original_docs = await asyncio.gather(
+                self._areformulate(query),
+                self._aretrieve(query, callbacks)
+            )
+        else:
+            alternative_queries = await self._areformulate(query)
+        
+        # Retrieve documents for the alternative queries not already covered
+        pending = [
+            alt_query for alt_query in alternative_queries
+            if not (prefetch_original and alt_query == query)
+        ]
+        pending_docs = await asyncio.gather(
+            *(self._aretrieve(alt_query, callbacks) for alt_query in pending)
+        )
+        docs_by_query = dict(zip(pending, pending_docs))
+        if prefetch_original:
+            docs_by_query[query] = original_docs
+        
+        # Combine in alternative query order, matching the synchronous path
         all_docs = []
         for alt_query in alternative_queries:
-            try:
-                # Use base retriever to get documents for this alternative query
-                docs = self.base_retriever.get_relevant_documents(
-                    alt_query, callbacks=run_manager.get_child()
-                )
-                all_docs.extend(docs)
-                print(f"Retrieved {len(docs)} docs for query: '{alt_query}'")
-            except Exception as e:
-                print(f"Error retrieving documents for query '{alt_query}': {e}")
+            all_docs.extend(docs_by_query[alt_query])
         
+        return self._finalize_documents(all_docs, query)
+    
+    def _finalize_documents(self, all_docs: List[Document], query: str) -> List[Document]:
+        """
+        Deduplicate, filter and truncate the combined documents.
+        
+        Args:
+            all_docs: Documents from every alternative query, in query order.
+            query: Original user query string.
+            
+        Returns:
+            At most k relevant documents.
+        """
         # Remove duplicate documents by page_content
         unique_docs = self._deduplicate_documents(all_docs)
         print(f"Total unique documents after deduplication: {len(unique_docs)}")
@@ -78,9 +164,139 @@ class EnhancedNutritionRetriever(NutritionRetriever):
         filtered_docs = self._apply_domain_filters(unique_docs, query)
         
         # Limit to k documents
-        final_docs = filtered_docs[:self.k]
+        return filtered_docs[:self.k]
+    
+    def _can_batch_vector_search(self) -> bool:
+        """
+        Check whether the base retriever can search with precomputed embeddings.
+        
+        Returns:
+            True for similarity and MMR vector store retrievers whose store
+            exposes its embedding model.
+        """
+        return (
+            isinstance(self.base_retriever, VectorStoreRetriever)
+            and self.base_retriever.search_type in ("similarity", "mmr")
+            and self.base_retriever.vectorstore.embeddings is not None
+        )
+    
+    def _search_by_vector(self, embedding: List[float]) -> List[Document]:
+        """Run the base retriever's search for one precomputed query embedding."""
+        retriever = self.base_retriever
+        if retriever.search_type == "mmr":
+            return retriever.vectorstore.max_marginal_relevance_search_by_vector(
+                embedding, **retriever.search_kwargs
+            )
+        return retriever.vectorstore.similarity_search_by_vector(
+            embedding, **retriever.search_kwargs
+        )
+    
+    def _batched_vector_search(self, queries: List[str]) -> Optional[List[List[Document]]]:
+        """
+        Embed all queries in one call and search the vector store with each embedding.
+        
+        Args:
+            queries: Query strings to retrieve documents for.
+            
+        Returns:
+            Documents per query, or None if the base retriever can't be batched
+            or batching failed and the per-query path should be used.
+        """
+        if not self._can_batch_vector_search():
+            return None
+        try:
+            # The stores used here embed queries and documents with the same
+            # model, so one embed_documents call covers every query
+            embeddings = self.base_retriever.vectorstore.embeddings.embed_documents(queries)
+            docs_per_query = [self._search_by_vector(embedding) for embedding in embeddings]
+        except Exception as e:
+            print(f"Error during batched vector search, retrieving per query: {e}")
+            return None
+        
+        for query, docs in zip(queries, docs_per_query):
+            print(f"Retrieved {len(docs)} docs for query: '{query}'")
+        return list(docs_per_query)
+    
+    async def _abatched_vector_search(self, queries: List[str]) -> Optional[List[List[Document]]]:
+        """
+        Asynchronously embed all queries in one call and search with each embedding.
+        
+        Args:
+            queries: Query strings to retrieve documents for.
+            
+        Returns:
+            Documents per query, or None if batching failed.
+        """
+        try:
+            embeddings = await self.base_retriever.vectorstore.embeddings.aembed_documents(queries)
+            docs_per_query = await asyncio.gather(
+                *(run_in_executor(None, self._search_by_vector, embedding) for embedding in embeddings)
+            )
+        except Exception as e:
+            print(f"Error during batched vector search, retrieving per query: {e}")
+            return None
+        
+        for query, docs in zip(queries, docs_per_query):
+            print(f"Retrieved {len(docs)} docs for query: '{query}'")
+        return list(docs_per_query)
+    
+    async def _areformulate(self, query: str) -> List[str]:
+        """
+        Generate alternative queries without blocking the event loop.
+        
+        Args:
+            query: Original user query string.
+            
+        Returns:
+            List of alternative queries, limited to max_queries.
+        """
+        try:
+            alternative_queries = await run_in_executor(
+                None, self.query_reformulator.rewrite_query, query
+            )
+            return alternative_queries[:self.max_queries]
+        except Exception as e:
+            print(f"Error during query reformulation: {e}")
+            # Fall back to original query if reformulation fails
+            return [query]
+    
+    def _retrieve(self, query: str, callbacks: Any) -> List[Document]:
+        """
+        Retrieve documents for a single query from the base retriever.
         
-        return final_docs
+        Args:
+            query: Query string to retrieve documents for.
+            callbacks: Child callbacks for the retriever run.
+            
+        Returns:
+            List of retrieved documents, empty if retrieval failed.
+        """
+        try:
+            docs = self.base_retriever.invoke(query, config={"callbacks": callbacks})
+            print(f"Retrieved {len(docs)} docs for query: '{query}'")
+            return docs
+        except Exception as e:
+            print(f"Error retrieving documents for query '{query}': {e}")
+            return []
+    
+    async def _aretrieve(self, query: str, callbacks: Any) -> List[Document]:
+        """
+        Retrieve documents for a single query from the base retriever.
+        
+        Args:
+            query: Query string to retrieve documents for.
+            callbacks: Child callbacks for the retriever run.
+            
+        Returns:
+            List of retrieved documents, empty if retrieval failed.
+        """
+        try:
+            docs = await self.base_retriever.ainvoke(query, config={"callbacks": callbacks})
+            print(f"Retrieved {len(docs)} docs for query: '{query}'")
+            return docs
+        except Exception as e:
+            print(f"Error retrieving documents for query '{query}': {e}")
+            return []
     
     def _deduplicate_documents(self, docs: List[Document]) -> List[Document]:
         """
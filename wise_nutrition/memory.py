@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from uuid import UUID, uuid4
 from datetime import datetime
 import os
+import re
 import json
 
 from langchain_core.messages import (
@@ -14,10 +15,16 @@ from langchain_core.messages import (
     AIMessage,
     SystemMessage
 )
-from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_community.chat_message_histories import ChatMessageHistory
+from langchain_core.chat_history import BaseChatMessageHistory, InMemoryChatMessageHistory
 from langgraph.checkpoint.base import BaseCheckpointSaver
 
+# Used when no checkpoint directory is passed and CONVERSATION_CHECKPOINT_DIR is unset
+DEFAULT_CHECKPOINT_DIR = ".conversation_checkpoints"
+
+# Checkpoint keys become file names, so only plain identifiers such as UUIDs
+# and Firebase uids are accepted; anything else could escape checkpoint_dir
+SAFE_KEY_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
 
 class FileSystemCheckpointSaver(BaseCheckpointSaver):
     """File system based checkpoint saver for persistent storage."""
@@ -28,7 +35,14 @@ class FileSystemCheckpointSaver(BaseCheckpointSaver):
         os.makedirs(checkpoint_dir, exist_ok=True)
     
     def _get_file_path(self, key: str) -> str:
-        """Get the file path for a given key."""
+        """
+        Get the file path for a given key.
+        
+        Raises:
+            ValueError: If the key is not a plain identifier
+        """
+        if not isinstance(key, str) or not SAFE_KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"Invalid checkpoint key: {key!r}")
         return os.path.join(self.checkpoint_dir, f"{key}.json")
     
     def save(self, key: str, state: Dict[str, Any]) -> None:
@@ -112,7 +126,7 @@ class ConversationMemoryManager:
     def __init__(
         self,
         max_messages: int = 10,
-        checkpoint_dir: str = ".conversation_checkpoints",
+        checkpoint_dir: Optional[str] = None,
         system_message: Optional[str] = None,
         memory_saver: Optional[BaseCheckpointSaver] = None
     ):
@@ -121,13 +135,16 @@ class ConversationMemoryManager:
 
         Args:
             max_messages: Maximum number of messages to keep in history (excluding system message)
-            checkpoint_dir: Directory to store conversation checkpoints
+            checkpoint_dir: Directory to store conversation checkpoints. If None, uses
+                CONVERSATION_CHECKPOINT_DIR, falling back to DEFAULT_CHECKPOINT_DIR.
             system_message: Optional custom system message. If None, uses default.
             memory_saver: Optional pre-configured checkpoint saver. If None, creates FileSystemCheckpointSaver.
         """
         self.max_messages = max_messages
-        self.checkpoint_dir = checkpoint_dir
-        self._memory_saver = memory_saver or FileSystemCheckpointSaver(checkpoint_dir)
+        self.checkpoint_dir = checkpoint_dir or os.environ.get(
+            "CONVERSATION_CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR
+        )
+        self._memory_saver = memory_saver or FileSystemCheckpointSaver(self.checkpoint_dir)
         self._default_system_message = system_message or (
             "I am a nutrition advisor AI. I can help you with questions about "
             "nutrition, vitamins, minerals, and healthy eating habits."
@@ -177,7 +194,8 @@ class ConversationMemoryManager:
         state.updated_at = datetime.utcnow()
         self._active_sessions[session_id] = state
         try:
-            self._memory_saver.save(session_id, state.model_dump())
+            # JSON mode lets pydantic-core serialize datetimes in one pass
+            self._memory_saver.save(session_id, state.model_dump(mode="json"))
         except Exception as e:
             print(f"Error saving session state: {e}")
 
@@ -189,8 +207,8 @@ class ConversationMemoryManager:
         # Load or create session state
         state = self._load_session_state(session_id)
         
-        # Convert state messages to ChatMessageHistory
-        history = ChatMessageHistory()
+        # Convert state messages to an in-memory chat history
+        history = InMemoryChatMessageHistory()
         
         for msg in state.messages:
             msg_type = msg["type"]
@@ -82,7 +82,7 @@ class RecommendationUpdate(BaseModel):
 class Recommendation(RecommendationBase):
     """Schema for recommendation response."""
     id: UUID = Field(description="Recommendation unique identifier")
-    user_id: UUID = Field(description="ID of the user who owns this recommendation")
+    user_id: str = Field(description="ID of the user who owns this recommendation")
     tags: List[Tag] = Field(default_factory=list, description="Associated tags")
     category: Optional[Category] = Field(None, description="Associated category")
     created_at: datetime = Field(description="When the recommendation was created")
@@ -100,7 +100,7 @@ class Recommendation(RecommendationBase):
                     "source": "nutrition_database",
                     "type": "vitamin"
                 }],
-                "user_id": "550e8400-e29b-41d4-a716-446655440000",
+                "user_id": "Ht7YxQ2mVbN9kLp4RsT1uWz3aBc8",
                 "tags": [{
                     "id": "550e8400-e29b-41d4-a716-446655440000",
                     "name": "vitamins",
@@ -140,7 +140,7 @@ class CategoryInDB(CategoryBase):
 class RecommendationInDB(RecommendationBase):
     """Database model for recommendations."""
     id: UUID = Field(default_factory=uuid4, description="Recommendation unique identifier")
-    user_id: UUID = Field(description="ID of the user who owns this recommendation")
+    user_id: str = Field(description="ID of the user who owns this recommendation")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="When the recommendation was created")
     updated_at: datetime = Field(default_factory=datetime.utcnow, description="When the recommendation was last updated")
     
@@ -37,14 +37,14 @@ class UserLogin(BaseModel):
 
 class UserResponse(UserBase):
     """Schema for user responses (without sensitive data)."""
-    id: UUID = Field(description="User's unique identifier")
+    id: str = Field(description="User's unique identifier (the Firebase UID)")
     created_at: datetime = Field(description="When the user was created")
     last_login: Optional[datetime] = Field(None, description="Last login timestamp")
 
     model_config = {
         "json_schema_extra": {
             "examples": [{
-                "id": "550e8400-e29b-41d4-a716-446655440000",
+                "id": "Ht7YxQ2mVbN9kLp4RsT1uWz3aBc8",
                 "email": "user@example.com",
                 "full_name": "John Doe",
                 "is_active": True,
@@ -79,6 +79,6 @@ class Token(BaseModel):
     
 class TokenData(BaseModel):
     """Schema for decoded JWT payload."""
-    user_id: UUID
+    user_id: str
     email: EmailStr
     exp: datetime 
\ No newline at end of file
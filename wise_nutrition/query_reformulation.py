@@ -6,7 +6,8 @@ retrieval accuracy by generating multiple perspectives on the original query.
 It uses LLMs to rewrite queries in ways that may capture different aspects 
 of the user's information need, particularly for nutrition-related queries.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from functools import lru_cache
 from pydantic import BaseModel, Field
 
 from langchain_core.prompts import PromptTemplate
@@ -57,8 +58,13 @@ class QueryReformulator:
     """
     Query reformulation system that generates multiple versions of a user query
     to improve retrieval results by considering different perspectives.
+    
+    Alternative queries are memoized per instance, so repeating a query does
+    not trigger another LLM call.
     """
     
+    cache_size: int = 1024
+    
     def __init__(
         self,
         llm: Runnable,
@@ -79,19 +85,20 @@ class QueryReformulator:
         self.prompt = prompt
         self.output_parser = output_parser or LineListOutputParser()
         self.include_original = include_original
+        self._rewrite_cached = lru_cache(maxsize=self.cache_size)(self._rewrite_impl)
     
-    def rewrite_query(self, original_query: str) -> List[str]:
+    def _rewrite_impl(self, query: str) -> Tuple[str, ...]:
         """
-        Rewrite the original query into multiple alternative queries.
+        Generate alternative queries with the LLM.
         
         Args:
-            original_query: The user's original query string.
+            query: The normalized user query.
             
         Returns:
-            A list of alternative query strings.
+            A tuple of alternative query strings.
         """
         # Format the prompt with the user's query
-        formatted_prompt = self.prompt.format(question=original_query)
+        formatted_prompt = self.prompt.format(question=query)
         
         # Generate alternative queries using the LLM
         # Use invoke instead of predict for newer LangChain versions
@@ -109,18 +116,37 @@ class QueryReformulator:
         alternative_queries = self.output_parser.parse(content)
         
         # Log the generated queries
-        print(f"Generated {len(alternative_queries)} alternative queries for: {original_query}")
-        for i, query in enumerate(alternative_queries):
-            print(f"  Query {i+1}: {query}")
+        print(f"Generated {len(alternative_queries)} alternative queries for: {query}")
+        for i, alternative in enumerate(alternative_queries):
+            print(f"  Query {i+1}: {alternative}")
+        
+        return tuple(alternative_queries)
+    
+    def rewrite_query(self, original_query: str) -> List[str]:
+        """
+        Rewrite the original query into multiple alternative queries.
+        
+        Args:
+            original_query: The user's original query string.
+            
+        Returns:
+            A list of alternative query strings.
+        """
+        query = original_query.strip()
+        alternative_queries = list(self._rewrite_cached(query))
         
         # Include the original query if specified
-        if self.include_original and original_query not in alternative_queries:
-            all_queries = [original_query] + alternative_queries
+        if self.include_original and query not in alternative_queries:
+            all_queries = [query] + alternative_queries
         else:
             all_queries = alternative_queries
             
         return all_queries
     
+    def clear_cache(self) -> None:
+        """Discard all memoized alternative queries."""
+        self._rewrite_cached.cache_clear()
+    
     def as_runnable(self) -> RunnableLambda:
         """Convert this query reformulator to a runnable lambda."""
         return RunnableLambda(self.rewrite_query) 
\ No newline at end of file
@@ -1,12 +1,12 @@
 """
 RAG chain implementation.
 """
+import asyncio
 from typing import Dict, Any, Optional, List, Callable
 from pydantic import BaseModel, Field # Import Pydantic
 
 from wise_nutrition.utils.prompts import DEFAULT_PROMPT, NUTRITION_BASE_PROMPT
 
-from langchain_openai import ChatOpenAI
 from langchain_core.runnables import ( # Updated imports
     Runnable,
     RunnableParallel,
@@ -16,23 +16,31 @@ from langchain_core.runnables import ( # Updated imports
     RunnableConfig,
     RunnableWithMessageHistory
 )
+from langchain_core.runnables.config import patch_config
+from langchain_core.callbacks import AsyncCallbackManagerForChainRun
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_community.chat_message_histories import ChatMessageHistory
 from uuid import UUID, uuid4
 
 # Import the memory components
-from wise_nutrition.memory import ConversationMemoryManager, ConversationState
+from wise_nutrition.memory import ConversationMemoryManager, ConversationState, SAFE_KEY_PATTERN
 from wise_nutrition.citation_generator import CitationGenerator, Citation
 
 # Define Input/Output Schemas using Pydantic
+# Longest query accepted from clients; anything longer is rejected before retrieval
+MAX_QUERY_LENGTH = 2048
+
 class RAGInput(BaseModel):
-    query: str = Field(description="The user's query.")
-    session_id: Optional[str] = Field(None, description="Optional session ID for conversation history.")
+    query: str = Field(min_length=1, max_length=MAX_QUERY_LENGTH, description="The user's query.")
+    session_id: Optional[str] = Field(
+        None,
+        pattern=SAFE_KEY_PATTERN.pattern,
+        description="Optional session ID for conversation history.",
+    )
 
 class RAGOutput(BaseModel):
     query: str = Field(description="The original user query.")
@@ -107,7 +115,7 @@ class NutritionRAGChain(RunnableSerializable[Dict[str, Any], Dict[str, Any]]):
         if not docs:
             return "No relevant information found."
         print(f"Formatting {len(docs)} documents.")
-        return "\n\n".join(doc.page_content for doc in docs if hasattr(doc, 'page_content'))
+        return "\n\n".join(doc.page_content for doc in docs)
 
     def extract_nutrition_data(self, docs: List[Document]) -> Dict[str, Any]:
         """
@@ -182,14 +190,7 @@ class NutritionRAGChain(RunnableSerializable[Dict[str, Any], Dict[str, Any]]):
         session_id = input_data.session_id
         
         if not query.strip():
-            return {
-                "query": query,
-                "response": "Please provide a valid query.",
-                "sources": [],
-                "citations": [],
-                "structured_data": {},
-                "session_id": session_id or str(uuid4())
-            }
+            return self._empty_query_result(query, session_id)
             
         # Get or create conversation state
         conversation = self.memory_manager.get_conversation_state(session_id)
@@ -202,23 +203,79 @@ class NutritionRAGChain(RunnableSerializable[Dict[str, Any], Dict[str, Any]]):
         # Process using core logic
         result = self._rag_core_logic({"query": query, "history": history, "session_id": session_id})
         
-        # Update conversation with new messages
-        conversation.add_user_message(query)
-        conversation.add_ai_message(result["response"])
+        return self._finish_turn(conversation, query, session_id, result)
+    
+    async def ainvoke(
+        self,
+        input_data: RAGInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously invoke the RAG chain with the given input data.
         
-        # Save conversation state
-        self.memory_manager.save_conversation_state(conversation)
+        Retrieval and generation are awaited instead of running the sync
+        chain in a worker thread, and both receive the run's callbacks so
+        astream_events can emit LLM tokens as they are generated.
         
-        # Return formatted result
+        Args:
+            input_data: RAGInput model containing the query and optional session_id
+            config: Optional configuration for the runnable
+            
+        Returns:
+            Dictionary containing the response and related information
+        """
+        return await self._acall_with_config(self._ainvoke, input_data, config, **kwargs)
+    
+    async def _ainvoke(
+        self,
+        input_data: RAGInput,
+        run_manager: AsyncCallbackManagerForChainRun,
+        config: RunnableConfig
+    ) -> Dict[str, Any]:
+        query = input_data.query
+        session_id = input_data.session_id
+        
+        if not query.strip():
+            return self._empty_query_result(query, session_id)
+        
+        # Conversation state lives on disk; keep its file I/O off the event loop
+        loop = asyncio.get_running_loop()
+        conversation = await loop.run_in_executor(
+            None, self.memory_manager.get_conversation_state, session_id
+        )
+        if session_id is None:
+            session_id = conversation.session_id
+        
+        child_config = patch_config(config, callbacks=run_manager.get_child())
+        result = await self._arag_core_logic(
+            {"query": query, "history": conversation.get_messages(), "session_id": session_id},
+            child_config
+        )
+        
+        return await loop.run_in_executor(
+            None, self._finish_turn, conversation, query, session_id, result
+        )
+    
+    def _empty_query_result(self, query: str, session_id: Optional[str]) -> Dict[str, Any]:
+        """Build the response returned for a blank query."""
         return {
             "query": query,
-            "response": result["response"],
-            "sources": result["sources"],
-            "citations": result["citations"],
-            "structured_data": result["structured_data"],
-            "session_id": session_id
+            "response": "Please provide a valid query.",
+            "sources": [],
+            "citations": [],
+            "structured_data": {},
+            "session_id": session_id or str(uuid4())
         }
     
+    def _finish_turn(
+        self,
+        conversation: ConversationState,
+        query: str,
+        session_id: str,
+        result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Record the exchange in the conversation and build the chain output."""
         # Update conversation with new messages
         conversation.add_user_message(query)
         conversation.add_ai_message(result["response"])
@@ -243,9 +300,6 @@ class NutritionRAGChain(RunnableSerializable[Dict[str, Any], Dict[str, Any]]):
         history = input_dict.get("history", [])
         session_id = input_dict.get("session_id", str(uuid4()))
 
-        # Filter history to prevent context window overflow
-        filtered_history = self.memory_manager.filter_messages(history)
-
         # Retrieve documents
         try:
             retrieved_docs = self.retriever.invoke(query)
@@ -253,6 +307,41 @@ class NutritionRAGChain(RunnableSerializable[Dict[str, Any], Dict[str, Any]]):
             print(f"Error during retrieval in core logic: {e}")
             retrieved_docs = []
 
+        # Generate response with the LLM
+        llm_response = self.llm.invoke(self._build_llm_messages(query, history, retrieved_docs))
+        
+        return self._build_result(query, session_id, llm_response, retrieved_docs)
+
+    async def _arag_core_logic(self, input_dict: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        query = input_dict["query"]
+        history = input_dict.get("history", [])
+        session_id = input_dict.get("session_id", str(uuid4()))
+
+        # Retrieve documents
+        try:
+            retrieved_docs = await self.retriever.ainvoke(query, config=config)
+        except Exception as e:
+            print(f"Error during retrieval in core logic: {e}")
+            retrieved_docs = []
+
+        # Generate response with the LLM
+        llm_response = await self.llm.ainvoke(
+            self._build_llm_messages(query, history, retrieved_docs),
+            config=config
+        )
+        
+        return self._build_result(query, session_id, llm_response, retrieved_docs)
+
+    def _build_llm_messages(
+        self,
+        query: str,
+        history: List[BaseMessage],
+        retrieved_docs: List[Document]
+    ) -> List[BaseMessage]:
+        """Combine the filtered history with the prompt for the current query."""
+        # Filter history to prevent context window overflow
+        filtered_history = self.memory_manager.filter_messages(history)
+
         # Format context
         context = self._format_docs(retrieved_docs)
 
@@ -263,10 +352,16 @@ class NutritionRAGChain(RunnableSerializable[Dict[str, Any], Dict[str, Any]]):
         )
         
         # Combine filtered history with current prompt for LLM
-        messages_for_llm = filtered_history + [prompt_with_values.to_messages()[0]]
+        return filtered_history + [prompt_with_values.to_messages()[0]]
 
-        # Generate response with the LLM
-        llm_response = self.llm.invoke(messages_for_llm)
+    def _build_result(
+        self,
+        query: str,
+        session_id: str,
+        llm_response: Any,
+        retrieved_docs: List[Document]
+    ) -> Dict[str, Any]:
+        """Assemble the chain result from the LLM response and retrieved documents."""
         response_text = llm_response.content if hasattr(llm_response, 'content') else str(llm_response)
         
         # Extract structured data (placeholder for now)
@@ -13,6 +13,27 @@ from langchain_core.documents import Document
 from langchain_core.language_models import BaseLLM
 from langchain_core.runnables import Runnable, RunnableLambda
 
+from wise_nutrition.utils.text import lowered, tokenize
+
+# Default authority sources for nutrition domains
+DEFAULT_AUTHORITY_SOURCES: Dict[str, float] = {
+    "nih.gov": 0.9,
+    "cdc.gov": 0.9,
+    "mayoclinic.org": 0.85,
+    "harvard.edu": 0.85,
+    "who.int": 0.9,
+    "nutrition.org": 0.8,
+    "nutritionfacts.org": 0.75,
+}
+
+# Nutrition terms looked for in queries by NutritionSpecificScorer
+NUTRITION_TERMS = (
+    "vitamin", "mineral", "protein", "carbohydrate", "fat", "omega",
+    "calcium", "iron", "zinc", "magnesium", "potassium", "sodium",
+    "fiber", "nutrient", "diet", "calorie", "supplement", "deficiency",
+    "meal", "nutrition", "food", "health", "metabolism"
+)
+
 class ReRankingConfig(BaseModel):
     """Configuration for document re-ranking."""
     
@@ -81,9 +102,9 @@ class SemanticSimilarityScorer(DocumentScorer):
         if not self.llm:
             # Default to basic keyword matching as fallback
             scores = []
-            query_terms = query.lower().split()
+            query_terms = tokenize(query)
             for doc in documents:
-                content = doc.page_content.lower()
+                content = lowered(doc.page_content)
                 # Count how many query terms appear in the document
                 term_matches = sum(1 for term in query_terms if term in content)
                 # Normalize by number of terms
@@ -144,19 +165,8 @@ class AuthorityScorer(DocumentScorer):
     def __init__(self, authority_sources: Optional[Dict[str, float]] = None, **kwargs):
         """Initialize with optional authority sources mapping."""
         
-        # Default authority sources for nutrition domains if none provided
-        default_authorities = {
-            "nih.gov": 0.9,
-            "cdc.gov": 0.9,
-            "mayoclinic.org": 0.85,
-            "harvard.edu": 0.85,
-            "who.int": 0.9,
-            "nutrition.org": 0.8,
-            "nutritionfacts.org": 0.75,
-        }
-        
         super().__init__(
-            authority_sources=authority_sources or default_authorities,
+            authority_sources=authority_sources or dict(DEFAULT_AUTHORITY_SOURCES),
             **kwargs
         )
     
@@ -196,7 +206,7 @@ class TermProximityScorer(DocumentScorer):
         """Score documents based on query term proximity."""
         
         scores = []
-        query_terms = [term.lower() for term in query.split() if len(term) > 2]
+        query_terms = [term for term in tokenize(query) if len(term) > 2]
         
         # If query is too short, return neutral scores
         if len(query_terms) < 2:
@@ -205,15 +215,12 @@ class TermProximityScorer(DocumentScorer):
         for doc in documents:
             score = 0.5  # Default score
             
-            # Simple implementation: check if consecutive query terms appear close together
-            content = doc.page_content.lower()
-            
             # Count instances where query terms are within a certain window of each other
             windows_found = 0
             window_size = 10  # words
             
-            # Convert content to word list for sliding window
-            words = content.split()
+            # Word list for sliding window, shared with other reranks of this document
+            words = tokenize(doc.page_content)
             
             # Slide window through the document
             for i in range(len(words) - window_size + 1):
@@ -241,24 +248,16 @@ class NutritionSpecificScorer(DocumentScorer):
         
         scores = []
         
-        # Extract potential nutrition terms from query
-        query_lower = query.lower()
-        nutrition_terms = [
-            "vitamin", "mineral", "protein", "carbohydrate", "fat", "omega", 
-            "calcium", "iron", "zinc", "magnesium", "potassium", "sodium",
-            "fiber", "nutrient", "diet", "calorie", "supplement", "deficiency",
-            "meal", "nutrition", "food", "health", "metabolism"
-        ]
-        
         # Check if query contains nutrition terms
-        query_nutrition_terms = [term for term in nutrition_terms if term in query_lower]
+        query_lower = query.lower()
+        query_nutrition_terms = [term for term in NUTRITION_TERMS if term in query_lower]
         
         for doc in documents:
             score = 0.5  # Default score
             
             # If query has nutrition terms, check if document contains the same terms
             if query_nutrition_terms:
-                content = doc.page_content.lower()
+                content = lowered(doc.page_content)
                 matches = sum(1 for term in query_nutrition_terms if term in content)
                 if matches > 0:
                     # Boost score based on nutrition term matches
@@ -352,6 +351,30 @@ class DocumentReRanker(BaseModel):
             **kwargs
         )
     
+    def _run_scorers(
+        self, documents: List[Document], query: str
+    ) -> List[Tuple[DocumentScorer, List[float]]]:
+        """
+        Run every scorer over the documents.
+        
+        Scorers that raise are reported and left out of the result.
+        
+        Args:
+            documents: Documents to score
+            query: The query to score against
+            
+        Returns:
+            List of (scorer, scores) pairs in scorer order
+        """
+        results = []
+        for scorer in self.scorers:
+            try:
+                results.append((scorer, scorer.score_documents(documents, query)))
+            except Exception as e:
+                print(f"Error in scorer {type(scorer).__name__}: {e}")
+        
+        return results
+    
     def rerank(self, documents: List[Document], query: str) -> List[Document]:
         """
         Rerank the documents based on the combined scores from all scorers.
@@ -375,42 +398,38 @@ class DocumentReRanker(BaseModel):
         if not docs_to_rerank:
             return documents
         
-        # Calculate scores from each scorer
-        all_scores = []
-        for scorer in self.scorers:
-            try:
-                scores = scorer.score_documents(docs_to_rerank, query)
-                # Normalize to ensure weights work as expected
-                if scores:
-                    max_score = max(scores) if max(scores) > 0 else 1.0
-                    normalized_scores = [score / max_score for score in scores]
-                    all_scores.append((normalized_scores, scorer.weight))
-            except Exception as e:
-                print(f"Error in scorer {type(scorer).__name__}: {e}")
-        
-        # Combine scores using weights
-        final_scores = []
-        for i in range(len(docs_to_rerank)):
-            total_score = sum(scores[i] * weight for scores, weight in all_scores)
-            total_weight = sum(weight for _, weight in all_scores)
-            combined_score = total_score / total_weight if total_weight > 0 else 0
-            final_scores.append(combined_score)
-        
-        # Create (document, score) pairs for sorting
-        doc_score_pairs = list(zip(docs_to_rerank, final_scores))
-        
-        # Sort by score in descending order
-        reranked_pairs = sorted(doc_score_pairs, key=lambda x: x[1], reverse=True)
-        
-        # Extract just the documents
-        reranked_docs = [doc for doc, _ in reranked_pairs]
+        # Stack scorer outputs into an (n_scorers, n_docs) matrix
+        scorer_results = [
+            (scorer, scores) for scorer, scores in self._run_scorers(docs_to_rerank, query)
+            if scores
+        ]
+        if scorer_results:
+            score_matrix = np.array([scores for _, scores in scorer_results], dtype=float)
+            weights = np.array([scorer.weight for scorer, _ in scorer_results], dtype=float)
+            
+            # Normalize each row by its max to ensure weights work as expected
+            row_max = score_matrix.max(axis=1)
+            row_max[row_max <= 0] = 1.0
+            score_matrix /= row_max[:, None]
+            
+            # Combine scores using weights
+            total_weight = weights.sum()
+            combined = weights @ score_matrix
+            final_scores = combined / total_weight if total_weight > 0 else np.zeros_like(combined)
+        else:
+            final_scores = np.zeros(len(docs_to_rerank))
+        
+        # Order by score in descending order; the stable sort keeps the
+        # retrieval order for ties, as sorted(..., reverse=True) did
+        order = np.argsort(-final_scores, kind="stable")
+        reranked_docs = [docs_to_rerank[i] for i in order]
         
         # Add any remaining documents that weren't reranked
         if remaining_docs:
             reranked_docs.extend(remaining_docs)
         
         # Print reranking summary
-        print(f"Reranked {len(docs_to_rerank)} documents. Top score: {final_scores[doc_score_pairs.index(reranked_pairs[0])]:.2f}")
+        print(f"Reranked {len(docs_to_rerank)} documents. Top score: {final_scores[order[0]]:.2f}")
         
         return reranked_docs
     
@@ -6,8 +6,23 @@ from typing import List, Dict, Any, Optional
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
-from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables import Runnable, RunnableConfig
 from wise_nutrition.reranker import DocumentReRanker, ReRankingConfig
+from wise_nutrition.utils.text import lowered, token_set, tokenize
+
+# Term lists for query intent detection
+NUTRIENT_TERMS = ("vitamin", "mineral", "protein", "carbohydrate", "fat",
+                  "omega", "calcium", "iron", "zinc", "magnesium", "potassium")
+FOOD_SOURCE_TERMS = ("source", "food", "contain", "rich in", "high in")
+HEALTH_TERMS = ("deficiency", "health", "condition", "disease", "symptom",
+                "prevent", "improve", "boost", "benefit")
+RECIPE_TERMS = ("recipe", "make", "cook", "prepare", "meal")
+COMPARISON_TERMS = ("vs", "versus", "compared to", "difference", "better")
+DIET_TERMS = ("vegan", "vegetarian", "keto", "paleo", "gluten", "lactose", "allergy",
+              "intolerance", "diet")
+
+# Sources boosted for health-related queries
+AUTHORITATIVE_SOURCES = ("nih.gov", "cdc.gov", "who.int", "mayoclinic")
 
 
 class NutritionRetriever(BaseRetriever):
@@ -163,37 +178,31 @@ class NutritionRetriever(BaseRetriever):
         }
         
         # Check for nutrient information intent
-        nutrient_terms = ["vitamin", "mineral", "protein", "carbohydrate", "fat", 
-                         "omega", "calcium", "iron", "zinc", "magnesium", "potassium"]
-        for term in nutrient_terms:
+        for term in NUTRIENT_TERMS:
             if term in query_lower:
                 intents["nutrient_info"] += 0.3
                 break
                 
         # Check for food sources intent
-        if any(term in query_lower for term in ["source", "food", "contain", "rich in", "high in"]):
+        if any(term in query_lower for term in FOOD_SOURCE_TERMS):
             intents["food_sources"] += 0.3
             
         # Check for health condition intent
-        health_terms = ["deficiency", "health", "condition", "disease", "symptom", 
-                       "prevent", "improve", "boost", "benefit"]
-        for term in health_terms:
+        for term in HEALTH_TERMS:
             if term in query_lower:
                 intents["health_condition"] += 0.2
                 break
                 
         # Check for recipe intent
-        if any(term in query_lower for term in ["recipe", "make", "cook", "prepare", "meal"]):
+        if any(term in query_lower for term in RECIPE_TERMS):
             intents["recipe"] += 0.4
             
         # Check for comparison intent
-        if any(term in query_lower for term in ["vs", "versus", "compared to", "difference", "better"]):
+        if any(term in query_lower for term in COMPARISON_TERMS):
             intents["comparison"] += 0.3
             
         # Check for dietary restriction intent
-        diet_terms = ["vegan", "vegetarian", "keto", "paleo", "gluten", "lactose", "allergy", 
-                     "intolerance", "diet"]
-        for term in diet_terms:
+        for term in DIET_TERMS:
             if term in query_lower:
                 intents["dietary_restriction"] += 0.3
                 break
@@ -215,12 +224,13 @@ class NutritionRetriever(BaseRetriever):
         Returns a list of scores, one per document.
         """
         scores = []
-        query_terms = [term.lower() for term in query.split() if len(term) > 2]
+        query_terms = [term for term in tokenize(query) if len(term) > 2]
         
         for doc in docs:
             # Initialize score
             keyword_score = 0.0
-            content = doc.page_content.lower()
+            content = lowered(doc.page_content)
+            content_tokens = token_set(doc.page_content)
             
             # Simple term frequency scoring
             for term in query_terms:
@@ -231,10 +241,8 @@ class NutritionRetriever(BaseRetriever):
                     keyword_score += min(0.2, 0.05 * term_count)
                     
                     # Give extra boost for exact term matches (not substring matches)
-                    for word in content.split():
-                        if word == term:  # Exact match
-                            keyword_score += 0.1
-                            break
+                    if term in content_tokens:
+                        keyword_score += 0.1
             
             # Check for exact phrases (higher weight)
             for i in range(len(query_terms) - 1):
@@ -283,7 +291,7 @@ class NutritionRetriever(BaseRetriever):
         # Boost authoritative sources for health-related queries
         source = doc.metadata.get('source', '').lower()
         if query_intent["health_condition"] > 0:
-            if any(src in source for src in ["nih.gov", "cdc.gov", "who.int", "mayoclinic"]):
+            if any(src in source for src in AUTHORITATIVE_SOURCES):
                 boost += 0.3
                 
         # Recency boost for time-sensitive content
@@ -307,14 +315,17 @@ class NutritionRetriever(BaseRetriever):
         """Logic to check if doc matches filters based on query context."""
         return True
 
-    def as_runnable(self) -> RunnableLambda:
+    def as_runnable(self) -> Runnable:
         """
-        Convert this retriever to a runnable lambda for use in LCEL chains.
+        Return this retriever as a runnable for use in LCEL chains.
+
+        Retrievers are already runnables, and using the retriever directly
+        keeps ``ainvoke`` routed to the native async retrieval path.
 
         Returns:
-            A runnable lambda wrapping the retriever logic.
+            The retriever itself.
         """
-        return RunnableLambda(self.get_relevant_documents)
+        return self
 
     @classmethod
     def with_reranker(
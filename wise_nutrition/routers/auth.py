@@ -2,7 +2,6 @@
 Authentication router for user registration, login, and management.
 """
 from typing import Dict, Any
-from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from wise_nutrition.models.user import UserCreate, UserResponse, UserLogin, Token
@@ -81,7 +80,7 @@ async def verify_email(verification_data: Dict[str, str]):
 # Optional: Admin-only endpoints
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def read_user(
-    user_id: UUID,
+    user_id: str,
     current_user: UserResponse = Depends(get_current_active_user)
 ):
     """
@@ -101,7 +100,7 @@ async def read_user(
 
 @router.delete("/users/{user_id}")
 async def delete_user(
-    user_id: UUID,
+    user_id: str,
     current_user: UserResponse = Depends(get_current_active_user)
 ):
     """
@@ -2,20 +2,22 @@
 Router for query reformulation endpoints.
 """
 from typing import Dict, List, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from langchain_core.language_models import BaseLLM
 from langchain_core.runnables import Runnable 
 
 from wise_nutrition.query_reformulation import QueryReformulator
+from wise_nutrition.rag_chain import MAX_QUERY_LENGTH
 from wise_nutrition.dependencies import get_llm, get_query_reformulator
 
 router = APIRouter(prefix="/api/v1/query", tags=["Query Reformulation"])
 
 class QueryRequest(BaseModel):
     """Request model for query reformulation."""
-    query: str
+    query: str = Field(min_length=1, max_length=MAX_QUERY_LENGTH)
 
 class QueryResponse(BaseModel):
     """Response model for reformulated queries."""
@@ -38,7 +40,8 @@ async def reformulate_query(
         A list of reformulated queries.
     """
     try:
-        reformulated_queries = query_reformulator.rewrite_query(request.query)
+        # The reformulator calls the LLM synchronously, so keep it off the event loop
+        reformulated_queries = await run_in_threadpool(query_reformulator.rewrite_query, request.query)
         return QueryResponse(
             original_query=request.query,
             reformulated_queries=reformulated_queries
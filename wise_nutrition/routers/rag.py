@@ -2,24 +2,80 @@
 Router for the RAG chain endpoints using FastAPI dependencies.
 """
 from typing import Annotated, Optional, Dict, List, Any, AsyncIterator
-from fastapi import APIRouter, Depends, Request, Header, HTTPException, status, Response
+from fastapi import APIRouter, Depends, FastAPI, Request, Header, HTTPException, status, Response
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from wise_nutrition.rag_chain import NutritionRAGChain, RAGInput, RAGOutput
+from wise_nutrition.rag_chain import NutritionRAGChain, RAGInput, RAGOutput, MAX_QUERY_LENGTH
 from wise_nutrition.dependencies import get_rag_chain, get_retriever, get_llm, get_memory_manager, get_reranking_retriever, get_enhanced_reranking_retriever, get_citation_generator
 from wise_nutrition.models.user import UserResponse
 from wise_nutrition.auth.firebase_auth import get_current_active_user
-from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langchain_core.documents import Document
 from langserve import add_routes
+import asyncio
+import orjson
 import uuid
 
 # Main router with prefix
 router = APIRouter(prefix="/api/v1", tags=["RAG Chain"])
 
-# Create a dedicated router for LangServe routes (without prefix)
-langserve_router = APIRouter(tags=["RAG Chain"])
+def _json_string(value: str) -> str:
+    """Encode a string as a JSON string literal."""
+    return orjson.dumps(value).decode()
+
+async def _stream_rag_events(
+    rag_chain: NutritionRAGChain,
+    input_data: RAGInput,
+    config: RunnableConfig
+) -> AsyncIterator[str]:
+    """
+    Stream a RAG chain run as one JSON document.
+    
+    Args:
+        rag_chain: The chain to run
+        input_data: The chain input
+        config: Run configuration
+        
+    Yields:
+        Fragments of the JSON response
+    """
+    session_id = input_data.session_id or str(uuid.uuid4())
+    yield f'{{"streaming": true, "session_id": {_json_string(session_id)}, "response_chunks": ['
+    
+    first_chunk = True
+    final_response = None
+    
+    # Use astream_events to get structured events
+    async for event in rag_chain.astream_events(input_data, config=config, version="v1"):
+        kind = event["event"]
+        
+        # Stream tokens from the LLM/ChatModel
+        if kind == "on_chat_model_stream":
+            content = event["data"]["chunk"].content
+            if content:
+                if first_chunk:
+                    yield _json_string(content)
+                    first_chunk = False
+                else:
+                    yield f", {_json_string(content)}"
+        
+        # Capture the final response when the full chain finishes
+        elif kind == "on_chain_end":
+            if event["name"] == "NutritionRAGChain": # Check for the end of the main chain
+                final_response = event["data"].get("output")
+    
+    # Add final response data at the end
+    # Ensure final_response structure is accessed correctly if it's not a simple dict
+    response_text = ""
+    if isinstance(final_response, dict):
+        response_text = final_response.get("response", "")
+    elif isinstance(final_response, str): # Handle cases where output might be a string
+        response_text = final_response
+    
+    yield f'], "query": {_json_string(input_data.query)}'
+    yield f', "complete_response": {_json_string(response_text)}'
+    yield '}'
 
 # Public endpoint with limited functionality
 @router.post("/nutrition_rag_chain/public", response_model=RAGOutput)
@@ -32,9 +88,10 @@ async def invoke_rag_chain_public(
     May have rate limits or reduced functionality compared to the authenticated version.
     """
     try:
-        # Directly invoke the chain with the input data
-        result = rag_chain.invoke(input_data)
-        return RAGOutput(**result)
+        # Directly invoke the chain with the input data; response_model
+        # validates the result once on the way out
+        result = await rag_chain.ainvoke(input_data)
+        return result
     except Exception as e:
         print(f"Error in public endpoint: {e}")
         raise HTTPException(
@@ -56,53 +113,9 @@ async def stream_rag_chain_public(
         # Configure the run for streaming events
         config = RunnableConfig()
 
-        # Define the streaming function using astream_events
-        async def stream_response() -> AsyncIterator[str]:
-            yield '{{"streaming": true, "session_id": "{}", "response_chunks": ['.format(input_data.session_id or str(uuid.uuid4()))
-            
-            first_chunk = True
-            final_response = None
-            
-            # Use astream_events to get structured events
-            async for event in rag_chain.astream_events(input_data, config=config, version="v1"):
-                kind = event["event"]
-                
-                # Stream tokens from the LLM/ChatModel
-                if kind == "on_chat_model_stream":
-                    content = event["data"]["chunk"].content
-                    if content:
-                        # Escape quotes and newlines for JSON
-                        content = content.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-                        if first_chunk:
-                            yield f'"{content}"'
-                            first_chunk = False
-                        else:
-                            yield f', "{content}"'
-                
-                # Capture the final response when the full chain finishes
-                elif kind == "on_chain_end":
-                    if event["name"] == "NutritionRAGChain": # Check for the end of the main chain
-                        final_response = event["data"].get("output")
-
-            # Add final response data at the end
-            # Ensure final_response structure is accessed correctly if it's not a simple dict
-            query = input_data.query # Use the original input query
-            response_text = ""
-            if isinstance(final_response, dict):
-                response_text = final_response.get("response", "")
-            elif isinstance(final_response, str): # Handle cases where output might be a string
-                response_text = final_response
-            
-            # Escape final response text
-            response_text = response_text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-            
-            yield f'], "query": "{query}"'
-            yield f', "complete_response": "{response_text}"'
-            yield '}'
-        
         # Return a streaming response
         return StreamingResponse(
-            stream_response(),
+            _stream_rag_events(rag_chain, input_data, config),
             media_type="application/json"
         )
     except Exception as e:
@@ -113,7 +126,6 @@ async def stream_rag_chain_public(
         )
 
 # Custom endpoint to handle both LangServe and direct API formats
-@router.post("/nutrition_rag_chain/invoke")
 @router.post("/nutrition_rag_chain/invoke", response_model=RAGOutput)
 async def invoke_rag_chain(
     input_data: RAGInput,
@@ -126,14 +138,14 @@ async def invoke_rag_chain(
     """
     # Use the authenticated user's ID as the session ID if none provided
     if not input_data.session_id:
-        input_data.session_id = str(current_user.id)
+        input_data.session_id = current_user.id
     
     # Here you could add user-specific logic, like:
     # - Personalization based on user preferences
     # - Tracking user usage
     # - Access to premium features
     
-    result = rag_chain.invoke(input_data)
+    result = await rag_chain.ainvoke(input_data)
     return result
 
 # Streaming endpoint for real-time chat responses
@@ -153,52 +165,9 @@ async def stream_rag_chain(
         # Configure the run for streaming events
         config = RunnableConfig()
 
-        # Define the streaming function using astream_events
-        async def stream_response() -> AsyncIterator[str]:
-            yield '{{"streaming": true, "session_id": "{}", "response_chunks": ['.format(input_data.session_id or str(uuid.uuid4()))
-            
-            first_chunk = True
-            final_response = None
-
-            # Use astream_events to get structured events
-            async for event in rag_chain.astream_events(input_data, config=config, version="v1"):
-                kind = event["event"]
-                
-                # Stream tokens from the LLM/ChatModel
-                if kind == "on_chat_model_stream":
-                    content = event["data"]["chunk"].content
-                    if content:
-                        # Escape quotes and newlines for JSON
-                        content = content.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-                        if first_chunk:
-                            yield f'"{content}"'
-                            first_chunk = False
-                        else:
-                            yield f', "{content}"'
-                
-                # Capture the final response when the full chain finishes
-                elif kind == "on_chain_end":
-                     if event["name"] == "NutritionRAGChain": # Check for the end of the main chain
-                        final_response = event["data"].get("output")
-            
-            # Add final response data at the end
-            query = input_data.query # Use the original input query
-            response_text = ""
-            if isinstance(final_response, dict):
-                response_text = final_response.get("response", "")
-            elif isinstance(final_response, str):
-                response_text = final_response
-            
-            # Escape final response text
-            response_text = response_text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-
-            yield f'], "query": "{query}"'
-            yield f', "complete_response": "{response_text}"'
-            yield '}'
-        
         # Return a streaming response
         return StreamingResponse(
-            stream_response(),
+            _stream_rag_events(rag_chain, input_data, config),
             media_type="application/json"
         )
     except Exception as e:
@@ -246,7 +215,7 @@ async def debug_trace(
     This endpoint explicitly sets tracing configs.
     """
     from wise_nutrition.utils.config import Config
-    config = Config()
+    config = Config.instance()
     
     # Log the tracing configuration
     print(f"LangSmith tracing: {config.langsmith_tracing}")
@@ -269,7 +238,7 @@ async def debug_trace(
         os.environ["LANGCHAIN_TRACING_V2"] = "true"
         os.environ["LANGCHAIN_PROJECT"] = "debug_traces"
     
-    result = rag_chain.invoke(input_data, config=trace_config)
+    result = await rag_chain.ainvoke(input_data, config=trace_config)
     return result
 
 @router.get("/nutrition_rag_chain/health")
@@ -282,7 +251,7 @@ async def health_check():
 # --- Add a basic comparison endpoint to demonstrate the difference with reranking --- #
 class RetrievalRequest(BaseModel):
     """Request model for comparing retrieval approaches."""
-    query: str
+    query: str = Field(min_length=1, max_length=MAX_QUERY_LENGTH)
 
 class DocumentInfo(BaseModel):
     """Information about a retrieved document."""
@@ -315,11 +284,11 @@ async def compare_retrieval(
     """
     query = request.query
     
-    # Get results from standard retriever
-    standard_docs = standard_retriever.invoke(query)
-    
-    # Get results from reranking retriever
-    reranked_docs = reranking_retriever.invoke(query)
+    # Run both retrievers concurrently
+    standard_docs, reranked_docs = await asyncio.gather(
+        standard_retriever.ainvoke(query),
+        reranking_retriever.ainvoke(query),
+    )
     
     # Convert Document objects to DocumentInfo models
     standard_results = [
@@ -342,29 +311,36 @@ async def compare_retrieval(
         reranked_results=reranked_results
     )
 
-# Import dependencies instead of creating an instance directly
-from wise_nutrition.dependencies import (
-    get_retriever, 
-    get_llm, 
-    get_memory_manager, 
-    get_citation_generator
-)
+def _retrieve(query: str, config: RunnableConfig) -> List[Document]:
+    """Retrieve documents with the retriever currently provided by the dependencies."""
+    return get_retriever().invoke(query, config)
 
-# Create a chain instance to use with LangServe
-rag_chain_instance = get_rag_chain(
-    retriever=get_retriever(),
-    llm=get_llm(),
-    memory_manager=get_memory_manager(),
-    citation_generator=get_citation_generator()
-)
+async def _aretrieve(query: str, config: RunnableConfig) -> List[Document]:
+    """Async counterpart of ``_retrieve``."""
+    return await get_retriever().ainvoke(query, config)
 
-# Add LangServe routes for invoke, stream, and batch endpoints
-add_routes(
-    langserve_router,  # Use the router without prefix
-    rag_chain_instance,  # Pass the instance, not the class
-    path="/api/v1/nutrition_rag_chain",  # Include the full path
-    include_callback_events=True  # For better debugging
-)
-
-# Include the LangServe router in the main router
-router.include_router(langserve_router) 
\ No newline at end of file
+def add_langserve_routes(app: FastAPI) -> None:
+    """
+    Register the LangServe invoke, stream and batch routes for the RAG chain.
+    
+    The chain resolves ``get_retriever()`` on every call instead of holding
+    one retriever, so registering the routes doesn't build the vector store
+    and the chain picks up the real store once the background build that
+    replaces the fallback retriever finishes.
+    
+    Args:
+        app: The application to add the routes to
+    """
+    rag_chain_instance = get_rag_chain(
+        retriever=RunnableLambda(_retrieve, afunc=_aretrieve),
+        llm=get_llm(),
+        memory_manager=get_memory_manager(),
+        citation_generator=get_citation_generator()
+    )
+    
+    add_routes(
+        app,
+        rag_chain_instance,
+        path="/api/v1/nutrition_rag_chain",
+        include_callback_events=True  # For better debugging
+    )
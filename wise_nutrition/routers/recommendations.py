@@ -2,6 +2,7 @@
 Router for recommendation operations including tagging, categorization, and export.
 """
 import io
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Annotated
 from uuid import UUID
 from fastapi import (
@@ -31,18 +32,30 @@ from wise_nutrition.storage.recommendation_storage import RecommendationStorageS
 from wise_nutrition.storage.export_service import ExportService
 
 # Create router
-router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
+router = APIRouter(prefix="/api/v1/recommendations", tags=["Recommendations"])
 
 # --- Dependency Injection --- #
 
-def get_recommendation_storage() -> RecommendationStorageService:
-    """Dependency for recommendation storage."""
+@lru_cache(maxsize=1)
+def _recommendation_storage() -> RecommendationStorageService:
+    """Build the shared recommendation storage service and its Firestore client."""
     return RecommendationStorageService()
 
-def get_export_service() -> ExportService:
-    """Dependency for export service."""
+@lru_cache(maxsize=1)
+def _export_service() -> ExportService:
+    """Build the shared export service."""
     return ExportService()
 
+# The dependencies are coroutines so FastAPI resolves them on the event loop
+# instead of dispatching each one to the threadpool
+async def get_recommendation_storage() -> RecommendationStorageService:
+    """Dependency for recommendation storage."""
+    return _recommendation_storage()
+
+async def get_export_service() -> ExportService:
+    """Dependency for export service."""
+    return _export_service()
+
 # --- Tag Endpoints --- #
 
 @router.post("/tags", response_model=Tag, status_code=status.HTTP_201_CREATED)
@@ -92,8 +92,6 @@ class RecommendationStorageService:
         # Convert string UUIDs back to UUID objects
         if "id" in doc:
             doc["id"] = UUID(doc["id"])
-        if "user_id" in doc:
-            doc["user_id"] = UUID(doc["user_id"])
         if "category_id" in doc and doc["category_id"]:
             doc["category_id"] = UUID(doc["category_id"])
         if "tag_ids" in doc:
@@ -402,7 +400,7 @@ class RecommendationStorageService:
     
     # --- Recommendation Operations --- #
     
-    async def create_recommendation(self, user_id: UUID, data: RecommendationCreate) -> Recommendation:
+    async def create_recommendation(self, user_id: str, data: RecommendationCreate) -> Recommendation:
         """
         Create a new recommendation.
         
@@ -460,7 +458,7 @@ class RecommendationStorageService:
             updated_at=recommendation.updated_at
         )
     
-    async def get_recommendation(self, rec_id: UUID, user_id: Optional[UUID] = None) -> Optional[Recommendation]:
+    async def get_recommendation(self, rec_id: UUID, user_id: Optional[str] = None) -> Optional[Recommendation]:
         """
         Get a recommendation by ID, optionally filtering by user_id.
         
@@ -510,7 +508,7 @@ class RecommendationStorageService:
         )
     
     async def get_recommendations(self, 
-                             user_id: UUID, 
+                             user_id: str, 
                              tag_ids: Optional[List[UUID]] = None,
                              category_id: Optional[UUID] = None,
                              search_query: Optional[str] = None,
@@ -530,7 +528,7 @@ class RecommendationStorageService:
         Returns:
             List of recommendations
         """
-        query = self.db.collection(self.recommendations_collection).where("user_id", "==", str(user_id))
+        query = self.db.collection(self.recommendations_collection).where("user_id", "==", user_id)
         
         # Apply category filter if provided
         if category_id:
@@ -590,7 +588,7 @@ class RecommendationStorageService:
     
     async def update_recommendation(self, 
                                rec_id: UUID, 
-                               user_id: UUID, 
+                               user_id: str, 
                                data: RecommendationUpdate) -> Optional[Recommendation]:
         """
         Update a recommendation.
@@ -646,7 +644,7 @@ class RecommendationStorageService:
         # Get updated document
         return await self.get_recommendation(rec_id, user_id)
     
-    async def delete_recommendation(self, rec_id: UUID, user_id: UUID) -> bool:
+    async def delete_recommendation(self, rec_id: UUID, user_id: str) -> bool:
         """
         Delete a recommendation.
         
@@ -665,7 +663,7 @@ class RecommendationStorageService:
             
         # Check ownership
         rec_data = rec_doc.to_dict()
-        if rec_data.get("user_id") != str(user_id):
+        if rec_data.get("user_id") != user_id:
             return False
             
         # Delete the recommendation
@@ -2,11 +2,52 @@
 Configuration utilities.
 """
 import os
+from functools import cache, lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 from dotenv import load_dotenv
 
-load_dotenv()
+
+@cache
+def ensure_env_loaded() -> None:
+    """
+    Load the .env file into the process environment once.
+    
+    Later calls are no-ops, and variables that are already set are never
+    overridden, so explicit environment settings always win over .env.
+    """
+    load_dotenv(override=False)
+
+
+# Environment variables Config reads; only these are snapshotted
+REQUIRED_KEYS = frozenset({
+    "OPENAI_API_KEY",
+    "WEAVIATE_URL",
+    "WEAVIATE_API_KEY",
+})
+
+OPTIONAL_KEYS = frozenset({
+    "WEAVIATE_COLLECTION_NAME",
+    "ANTHROPIC_API_KEY",
+    "GOOGLE_API_KEY",
+    "OPENAI_MODEL_DEFAULT",
+    "ANTHROPIC_MODEL_DEFAULT",
+    "GOOGLE_MODEL_DEFAULT",
+    "OPENAI_MODEL_HIGH_PERFORMANCE",
+    "ANTHROPIC_MODEL_HIGH_PERFORMANCE",
+    "GOOGLE_MODEL_HIGH_PERFORMANCE",
+    "CHROMA_PERSIST_DIRECTORY",
+    "CHROMA_COLLECTION_NAME",
+    "VECTOR_DB_TYPE",
+    "VECTOR_BACKEND",
+    "LANGSMITH_API_KEY",
+    "LANGSMITH_PROJECT",
+    "LANGSMITH_ENDPOINT",
+    "LANGSMITH_TRACING",
+    "CORS_ALLOW_ORIGINS",
+    "CONVERSATION_CHECKPOINT_DIR",
+})
 
 
 class ConfigurationError(Exception):
@@ -19,39 +60,65 @@ class ConfigurationError(Exception):
 class Config:
     """
     Application configuration manager.
+    
+    Use Config.instance() to share one validated configuration per process;
+    constructing Config() directly always re-reads the environment.
     """
     
+    @classmethod
+    @lru_cache(maxsize=1)
+    def instance(cls) -> "Config":
+        """
+        Get the shared configuration instance.
+        
+        The instance is built on first use and reused afterwards. Call
+        Config.instance.cache_clear() to pick up environment changes.
+        
+        Returns:
+            The process-wide Config instance
+        """
+        return cls()
+    
     def __init__(self):
         """
         Initialize the configuration manager.
         
         """
-        self._config_cache = {}
+        ensure_env_loaded()
+        
+        # Read the known keys once; every lookup below goes through this snapshot
+        self._env = MappingProxyType({
+            key: os.environ[key]
+            for key in REQUIRED_KEYS | OPTIONAL_KEYS
+            if key in os.environ
+        })
+        
         self._openai_api_key = self._get_required_env_var("OPENAI_API_KEY")
         self._weaviate_url = self._get_required_env_var("WEAVIATE_URL")
         self._weaviate_api_key = self._get_required_env_var("WEAVIATE_API_KEY")
         
-        self._weaviate_collection_name = os.getenv("WEAVIATE_COLLECTION_NAME", "nutrition_collection")
-        self._anthropic_api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        self._google_api_key = os.getenv("GOOGLE_API_KEY", "")
-        self._openai_model_default = os.getenv("OPENAI_MODEL_DEFAULT", "gpt-3.5-turbo")
-        self._anthropic_model_default = os.getenv("ANTHROPIC_MODEL_DEFAULT", "claude-3-5-sonnet-20240620")
-        self._google_model_default = os.getenv("GOOGLE_MODEL_DEFAULT", "gemini-2.0-flash-lite")
-        self._openai_model_high_performance = os.getenv("OPENAI_MODEL_HIGH_PERFORMANCE", "gpt-4o")
-        self._anthropic_model_high_performance = os.getenv("ANTHROPIC_MODEL_HIGH_PERFORMANCE")  
-        self._google_model_high_performance = os.getenv("GOOGLE_MODEL_HIGH_PERFORMANCE", "gemini-2.0-flash")
+        self._weaviate_collection_name = self._env.get("WEAVIATE_COLLECTION_NAME", "nutrition_collection")
+        self._anthropic_api_key = self._env.get("ANTHROPIC_API_KEY", "")
+        self._google_api_key = self._env.get("GOOGLE_API_KEY", "")
+        self._openai_model_default = self._env.get("OPENAI_MODEL_DEFAULT", "gpt-3.5-turbo")
+        self._anthropic_model_default = self._env.get("ANTHROPIC_MODEL_DEFAULT", "claude-3-5-sonnet-20240620")
+        self._google_model_default = self._env.get("GOOGLE_MODEL_DEFAULT", "gemini-2.0-flash-lite")
+        self._openai_model_high_performance = self._env.get("OPENAI_MODEL_HIGH_PERFORMANCE", "gpt-4o")
+        self._anthropic_model_high_performance = self._env.get("ANTHROPIC_MODEL_HIGH_PERFORMANCE")  
+        self._google_model_high_performance = self._env.get("GOOGLE_MODEL_HIGH_PERFORMANCE", "gemini-2.0-flash")
         
         # ChromaDB configuration
-        self._chroma_persist_directory = os.getenv("CHROMA_PERSIST_DIRECTORY", os.path.join(os.getcwd(), "chroma_db"))
-        self._chroma_collection_name = os.getenv("CHROMA_COLLECTION_NAME", "nutrition_collection")
-        self._vector_db_type = os.getenv("VECTOR_DB_TYPE", "weaviate")  # weaviate or chroma
+        self._chroma_persist_directory = self._env.get("CHROMA_PERSIST_DIRECTORY", os.path.join(os.getcwd(), "chroma_db"))
+        self._chroma_collection_name = self._env.get("CHROMA_COLLECTION_NAME", "nutrition_collection")
+        self._vector_db_type = self._env.get("VECTOR_DB_TYPE", "weaviate")  # weaviate or chroma
+        self._vector_backend = self._env.get("VECTOR_BACKEND", "chroma").lower()  # chroma or faiss
         
-        self._langsmith_api_key = os.getenv("LANGSMITH_API_KEY", "")
-        self._langsmith_project = os.getenv("LANGSMITH_PROJECT", "wise_nutrition")
-        self._langsmith_endpoint = os.getenv("LANGSMITH_ENDPOINT", "https://api.smith.langchain.com")
+        self._langsmith_api_key = self._env.get("LANGSMITH_API_KEY", "")
+        self._langsmith_project = self._env.get("LANGSMITH_PROJECT", "wise_nutrition")
+        self._langsmith_endpoint = self._env.get("LANGSMITH_ENDPOINT", "https://api.smith.langchain.com")
         
         # Convert string 'true'/'false' to boolean
-        tracing_value = os.getenv("LANGSMITH_TRACING", "false").lower()
+        tracing_value = self._env.get("LANGSMITH_TRACING", "false").lower()
         self._langsmith_tracing = tracing_value == "true" or tracing_value == "1"
         
         # Make sure LangSmith environment variables are set if tracing is enabled
@@ -75,7 +142,7 @@ class Config:
         """
         Get a required environment variable.
         """
-        value = os.getenv(var_name)
+        value = self._env.get(var_name)
         if value is None or value.strip() == "":
             raise ConfigurationError(f"Missing required environment variable: {var_name}")
         return value
@@ -227,6 +294,16 @@ class Config:
         """
         return self._vector_db_type
     
+    @property
+    def vector_backend(self) -> str:
+        """
+        Get the vector store backend for the API's sample retriever.
+        
+        Returns:
+            Vector store backend ('chroma' or 'faiss')
+        """
+        return self._vector_backend
+    
     @property
     def langsmith_api_key(self) -> str:
         """
@@ -266,17 +343,12 @@ class Config:
         Returns:
             Configuration value
         """
-        # First check if we have the attribute directly
-        if hasattr(self, f"_{key}"):
-            return getattr(self, f"_{key}")
+        # First check the public configuration properties
+        if isinstance(getattr(type(self), key, None), property):
+            return getattr(self, key)
         
-        # Then check environment variables
-        env_value = os.getenv(key.upper(), None)
-        if env_value is not None:
-            # Cache the value for future lookups
-            self._config_cache[key] = env_value
-            return env_value
-            
-        # Finally check the cache or return default
-        return self._config_cache.get(key, default)
-        
\ No newline at end of file
+        # Then the snapshot for known keys, and the live environment for the rest
+        env_key = key.upper()
+        if env_key in REQUIRED_KEYS or env_key in OPTIONAL_KEYS:
+            return self._env.get(env_key, default)
+        return os.environ.get(env_key, default)
@@ -0,0 +1,48 @@
+"""
+Shared HTTP connection pools for upstream API clients.
+"""
+from functools import lru_cache
+from importlib.util import find_spec
+
+import httpx
+
+# Pool sizing shared by the sync and async clients
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Connecting should be quick, but LLM responses can take a while to generate
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# HTTP/2 needs the optional h2 package (installed with the "prod" extra)
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide sync HTTP client.
+
+    Returns:
+        A keep-alive client that upstream SDK clients can share
+    """
+    return httpx.Client(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide async HTTP client.
+
+    Returns:
+        A keep-alive client that upstream SDK clients can share
+    """
+    return httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients, if they were created, and forget them."""
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    if get_async_http_client.cache_info().currsize:
+        await get_async_http_client().aclose()
+    get_http_client.cache_clear()
+    get_async_http_client.cache_clear()
@@ -3,6 +3,8 @@ Logging utilities.
 """
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 
@@ -61,4 +63,47 @@ class Logger:
         Args:
             message: Message to log
         """
-        pass 
\ No newline at end of file
+        pass
+
+
+def start_queue_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Route root-logger records through a queue drained by a background thread.
+    
+    Request handlers then only enqueue records; formatting and writing to
+    stderr happen on the listener thread. The level is applied to the
+    ``wise_nutrition`` logger only, so libraries such as httpx keep their
+    own levels and the root logger's default.
+    
+    Args:
+        level: Level for the application's loggers
+        
+    Returns:
+        The started listener; pass it to stop_queue_logging on shutdown
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+    
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    logging.getLogger("wise_nutrition").setLevel(level)
+    
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def stop_queue_logging(listener: QueueListener) -> None:
+    """
+    Flush and stop a listener started by start_queue_logging.
+    
+    Args:
+        listener: The listener to stop
+    """
+    listener.stop()
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, QueueHandler) and h.queue is listener.queue]:
+        root.removeHandler(handler)
@@ -2,7 +2,7 @@
 Prompts for the nutrition advisor.
 """
 import os
-from langchain.prompts import ChatPromptTemplate
+from langchain_core.prompts import ChatPromptTemplate
 # from langsmith import Client # Commented out LangSmith for now
 from wise_nutrition.utils.config import Config
 # from langchain import hub # Commented out LangSmith hub for now
@@ -0,0 +1,55 @@
+"""
+Text helpers shared by the keyword, proximity and nutrition scoring paths.
+"""
+import sys
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+# Entries are keyed on full document texts, so the caches are sized for the
+# documents of a few concurrent requests rather than the whole corpus
+TEXT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def lowered(text: str) -> str:
+    """
+    Lowercase a piece of text, caching the result.
+
+    Args:
+        text: Text to lowercase
+
+    Returns:
+        The lowercased text
+    """
+    return text.lower()
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    Split text into lowercase whitespace-delimited tokens.
+
+    Tokens are interned, so equal tokens from different documents share one
+    string object and compare by identity first.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Tuple of lowercase tokens in document order
+    """
+    return tuple(sys.intern(token) for token in lowered(text).split())
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def token_set(text: str) -> FrozenSet[str]:
+    """
+    Get the distinct lowercase tokens of a piece of text.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Frozen set of lowercase tokens for membership tests
+    """
+    return frozenset(tokenize(text))